@@ -0,0 +1,219 @@
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+
+from botocore.exceptions import ClientError  # type: ignore
+
+from logs import log_event
+
+logger = logging.getLogger(__name__)
+
+# Error codes worth retrying with backoff; everything else fails fast
+RETRYABLE_ERRORS = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+}
+
+
+# bedrock-runtime client from the AWS_* settings. Gateways build it on first use, so the
+# services can be imported (and given a stand-in client) without AWS credentials.
+def create_bedrock_client():
+    aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID")
+    aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY")
+    aws_region = os.getenv("AWS_REGION")
+    if not all([aws_access_key_id, aws_secret_access_key, aws_region]):
+        raise ValueError("Missing AWS credentials or region. Check your .env file!")
+    import boto3  # type: ignore
+
+    return boto3.client(
+        service_name="bedrock-runtime",
+        region_name=aws_region,
+        aws_access_key_id=aws_access_key_id,
+        aws_secret_access_key=aws_secret_access_key
+    )
+
+
+# Async token bucket: allows `burst` calls at once and refills at `rate` calls per second
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# Counters and recent latencies for calls made through a gateway
+class GatewayStats:
+    def __init__(self, window=1000):
+        self.calls = 0
+        self.retries = 0
+        self.throttles = 0
+        self.failures = 0
+        self.coalesced = 0
+        self.in_flight = 0
+        self.latencies = deque(maxlen=window)
+
+    def snapshot(self):
+        latencies = sorted(self.latencies)
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "throttles": self.throttles,
+            "failures": self.failures,
+            "coalesced": self.coalesced,
+            "in_flight": self.in_flight,
+            "p50_latency": latencies[len(latencies) // 2] if latencies else None,
+            "max_latency": latencies[-1] if latencies else None,
+        }
+
+
+# Bounded-concurrency, rate-limited async front end for bedrock-runtime invoke_model.
+# Identical in-flight requests are coalesced into a single model call and throttled
+# calls are retried with full-jitter exponential backoff on the event loop.
+# Pass a client, or leave it None to build one with client_factory on the first call.
+class BedrockGateway:
+    def __init__(self, client, model_id, max_concurrency=4, rate_per_sec=5.0, burst=5,
+                 max_retries=4, base_delay=1.0, max_delay=20.0, on_call=None,
+                 client_factory=create_bedrock_client):
+        self._client = client
+        self._client_lock = threading.Lock()
+        self.client_factory = client_factory
+        self.model_id = model_id
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.on_call = on_call
+        self.stats = GatewayStats()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._bucket = TokenBucket(rate_per_sec, burst)
+        self._inflight = {}
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self.client_factory()
+        return self._client
+
+    @client.setter
+    def client(self, client):
+        self._client = client
+
+    @classmethod
+    def from_env(cls, client, model_id, **overrides):
+        settings = {
+            "max_concurrency": int(os.getenv("BEDROCK_MAX_CONCURRENCY", "4")),
+            "rate_per_sec": float(os.getenv("BEDROCK_RATE_PER_SEC", "5")),
+            "burst": int(os.getenv("BEDROCK_BURST", "5")),
+            "max_retries": int(os.getenv("BEDROCK_MAX_RETRIES", "4")),
+        }
+        settings.update(overrides)
+        return cls(client, model_id, **settings)
+
+    # Generate text for a prompt; returns "" if the model could not be reached
+    async def invoke(self, prompt, **params):
+        body = json.dumps({"prompt": prompt, **params}, sort_keys=True)
+        key = hashlib.sha256(body.encode("utf-8")).hexdigest()
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats.coalesced += 1
+        else:
+            task = asyncio.ensure_future(self._invoke(body))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _invoke(self, body):
+        start = time.perf_counter()
+        retries = 0
+        result = None
+        async with self._semaphore:
+            self.stats.in_flight += 1
+            try:
+                for attempt in range(1, self.max_retries + 1):
+                    await self._bucket.acquire()
+                    try:
+                        result = await asyncio.to_thread(self._call_model, body)
+                        break
+                    except ClientError as e:
+                        code = e.response.get("Error", {}).get("Code", "")
+                        logger.warning(f"Bedrock ClientError (attempt {attempt}): {code} - {e}")
+                        if code == "ThrottlingException":
+                            self.stats.throttles += 1
+                        if code not in RETRYABLE_ERRORS or attempt == self.max_retries:
+                            break
+                    except Exception as e:
+                        logger.error(f"Bedrock Unexpected Error: {e}")
+                        break
+                    retries += 1
+                    self.stats.retries += 1
+                    backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                    await asyncio.sleep(backoff)
+            finally:
+                self.stats.in_flight -= 1
+
+        latency = time.perf_counter() - start
+        self.stats.calls += 1
+        self.stats.latencies.append(latency)
+        if result is None:
+            self.stats.failures += 1
+            logger.error(f"Bedrock invocation failed after {retries + 1} attempts.")
+        log_event(logger, "bedrock call finished", logging.DEBUG, latency=round(latency, 3), retries=retries)
+        if self.on_call:
+            self.on_call(latency, retries, result is not None)
+        return result or ""
+
+    def _call_model(self, body):
+        resp = self.client.invoke_model(
+            modelId=self.model_id,
+            body=body,
+            contentType="application/json",
+            accept="application/json"
+        )
+        return json.loads(resp["body"].read()).get("generation", "")
+
+
+# Local stand-in for the bedrock-runtime client with configurable latency and throttling
+class StubBedrockClient:
+    def __init__(self, responder=None, latency=0.0, throttle_rate=0.0):
+        self.responder = responder or (lambda prompt: "")
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.calls = 0
+
+    def invoke_model(self, modelId, body, contentType=None, accept=None):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if random.random() < self.throttle_rate:
+            raise ClientError(
+                {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}},
+                "InvokeModel"
+            )
+        prompt = json.loads(body).get("prompt", "")
+        payload = json.dumps({"generation": self.responder(prompt)}).encode("utf-8")
+        return {"body": io.BytesIO(payload)}
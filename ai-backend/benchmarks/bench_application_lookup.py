@@ -0,0 +1,68 @@
+# Benchmark: applicant lookup for a shortlist, one find_one per resume (old path)
+# vs a single projected $in query on the indexed resumeUrl.
+# Uses mongomock by default; set MONGO_URI to run against a local mongod.
+# Requires: pip install mongomock
+# Run from ai-backend/:  python benchmarks/bench_application_lookup.py [num_resumes]
+import asyncio
+import os
+import sys
+import time
+
+
+def collection():
+    uri = os.getenv("MONGO_URI")
+    if uri:
+        from pymongo import MongoClient
+
+        coll = MongoClient(uri).get_default_database()["bench_applications"]
+    else:
+        import mongomock  # type: ignore
+
+        coll = mongomock.MongoClient().db["bench_applications"]
+    coll.drop()
+    return coll
+
+
+def seed(coll, num_resumes):
+    urls = [f"https://resumes.s3.amazonaws.com/{i}.pdf" for i in range(num_resumes)]
+    coll.insert_many([
+        {"resumeUrl": url, "userName": f"Student {i}", "userEmail": f"s{i}@example.com",
+         "appliedDate": "2025-06-01", "studentId": f"id{i}", "jobTitle": "Intern", "coverLetter": "x" * 2000}
+        for i, url in enumerate(urls)
+    ])
+    coll.create_index("resumeUrl")
+    return urls
+
+
+async def per_resume(coll, urls):
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(*[
+        loop.run_in_executor(None, lambda url=url: coll.find_one({"resumeUrl": url})) for url in urls
+    ])
+
+
+async def bulk(coll, urls, projection):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, lambda: list(coll.find({"resumeUrl": {"$in": urls}}, projection)))
+
+
+def main(num_resumes):
+    # Same projection the shortlist uses, without importing the whole service
+    fields = ["studentId", "student_id", "studentID", "userName", "name",
+              "userEmail", "email", "appliedDate", "applied_date", "appliedOn"]
+    projection = {"_id": 0, "resumeUrl": 1, **{name: 1 for name in fields}}
+
+    coll = collection()
+    urls = seed(coll, num_resumes)
+    for name, runner in (("find_one x N", lambda: per_resume(coll, urls)),
+                         ("single $in", lambda: bulk(coll, urls, projection))):
+        start = time.perf_counter()
+        results = asyncio.run(runner())
+        elapsed = time.perf_counter() - start
+        assert len(results) == num_resumes
+        print(f"{name:>13}: {elapsed * 1000:9.1f} ms for {num_resumes} resumes")
+    coll.drop()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
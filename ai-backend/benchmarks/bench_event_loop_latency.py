@@ -0,0 +1,120 @@
+# Load test: event-loop latency while concurrent requests bulk-upsert shortlists and
+# page through them, with synchronous pymongo calls made on the loop (old path) vs Motor.
+# A probe task sleeps 1 ms at a time; how late it wakes up is the loop lag every other
+# request on the server would see.
+# Needs a mongod for meaningful numbers: MONGO_URI=mongodb://localhost/bench
+# Without MONGO_URI it falls back to mongomock / mongomock-motor, which only checks the
+# script runs (both are in-process, so neither path yields the loop).
+# Run from ai-backend/:  python benchmarks/bench_event_loop_latency.py [clients] [candidates]
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from database import bulk_write_batched, bulk_write_concern, get_database  # noqa: E402
+from pagination import fetch_page  # noqa: E402
+
+SORT = [("readiness_score", -1), ("similarity_score", -1), ("_id", -1)]
+
+
+def collections():
+    uri = os.getenv("MONGO_URI")
+    if uri:
+        from pymongo import MongoClient
+
+        sync_coll = MongoClient(uri).get_default_database()["bench_shortlist"]
+        async_coll = get_database(uri).get_collection("bench_shortlist", write_concern=bulk_write_concern())
+    else:
+        import mongomock  # type: ignore
+        import mongomock_motor  # type: ignore
+
+        sync_coll = mongomock.MongoClient().db["bench_shortlist"]
+        async_coll = mongomock_motor.AsyncMongoMockClient()["db"]["bench_shortlist"]
+    sync_coll.drop()
+    sync_coll.create_index([("internship_id", 1), ("resumeUrl", 1)])
+    sync_coll.create_index([("internship_id", 1)] + SORT)
+    return sync_coll, async_coll
+
+
+def upserts(internship_id, num_candidates):
+    return [
+        UpdateOne(
+            {"internship_id": internship_id, "resumeUrl": f"https://resumes.s3.amazonaws.com/{i}.pdf"},
+            {"$set": {"readiness_score": 60 + i % 40, "similarity_score": (i % 97) / 97,
+                      "name": f"Student {i}", "text": "resume text " * 200}},
+            upsert=True
+        )
+        for i in range(num_candidates)
+    ]
+
+
+async def request_sync(coll, num_candidates):
+    internship_id = ObjectId()
+    coll.bulk_write(upserts(internship_id, num_candidates), ordered=False)
+    query = {"internship_id": internship_id}
+    docs = list(coll.find(query, {"text": 0}).sort(SORT).limit(101))
+    while len(docs) > 100:
+        last = docs[99]
+        docs = list(coll.find(
+            {"$and": [query, {"$or": [
+                {"readiness_score": {"$lt": last["readiness_score"]}},
+                {"readiness_score": last["readiness_score"], "similarity_score": {"$lt": last["similarity_score"]}},
+                {"readiness_score": last["readiness_score"], "similarity_score": last["similarity_score"],
+                 "_id": {"$lt": last["_id"]}},
+            ]}]},
+            {"text": 0}
+        ).sort(SORT).limit(101))
+
+
+async def request_motor(coll, num_candidates):
+    internship_id = ObjectId()
+    await bulk_write_batched(coll, upserts(internship_id, num_candidates))
+    cursor = None
+    while True:
+        _, cursor = await fetch_page(coll, {"internship_id": internship_id}, SORT, 100, cursor, {"text": 0})
+        if not cursor:
+            break
+
+
+async def run(request, coll, clients, num_candidates):
+    lags = []
+    done = asyncio.Event()
+
+    async def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+
+    probe_task = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*[request(coll, num_candidates) for _ in range(clients)])
+    elapsed = time.perf_counter() - start
+    done.set()
+    await probe_task
+    return elapsed, lags
+
+
+def main(clients, num_candidates):
+    sync_coll, async_coll = collections()
+    if not os.getenv("MONGO_URI"):
+        print("MONGO_URI not set: using in-process mocks, latency numbers are not meaningful")
+    for name, request, coll in (("pymongo on loop", request_sync, sync_coll),
+                                ("motor", request_motor, async_coll)):
+        elapsed, lags = asyncio.run(run(request, coll, clients, num_candidates))
+        lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+        p99 = lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))]
+        print(f"{name:>15}: {elapsed * 1000:8.1f} ms total | loop lag p50 {statistics.median(lags_ms):7.2f} ms"
+              f"  p99 {p99:7.2f} ms  max {lags_ms[-1]:7.2f} ms  ({len(lags)} probes)")
+    sync_coll.drop()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 300)
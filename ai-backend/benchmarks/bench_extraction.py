@@ -0,0 +1,58 @@
+# Benchmark: PDF text extraction throughput (documents/sec) for the ExtractionEngine
+# at different process-pool sizes, against single-threaded in-process parsing.
+# Run from ai-backend/:  python benchmarks/bench_extraction.py [num_docs] [pages]
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # noqa: E402
+
+from extraction import ExtractionEngine, _extract_pdf_pages  # noqa: E402
+
+PARAGRAPH = ("Software engineer with experience in Python, Django, React and AWS. "
+             "Built data pipelines, REST APIs and CI/CD for distributed teams. ") * 6
+
+
+def synthetic_pdf(pages):
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(36, 36, 560, 800), f"Page {number + 1}\n" + PARAGRAPH * 4, fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+async def run_engine(engine, docs):
+    return await asyncio.gather(*[engine.extract_pdf(doc) for doc in docs])
+
+
+def main(num_docs, pages):
+    docs = [synthetic_pdf(pages) for _ in range(num_docs)]
+    print(f"{num_docs} PDFs x {pages} pages ({len(docs[0]) // 1024} KiB each)")
+
+    start = time.perf_counter()
+    for doc in docs:
+        _extract_pdf_pages(doc, 0, pages)
+    elapsed = time.perf_counter() - start
+    print(f"{'in-process':>12}: {num_docs / elapsed:8.1f} docs/sec")
+
+    counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    for workers in counts:
+        engine = ExtractionEngine(workers=workers, max_pages=pages)
+        asyncio.run(run_engine(engine, docs[:workers]))  # warm up worker processes
+        start = time.perf_counter()
+        asyncio.run(run_engine(engine, docs))
+        elapsed = time.perf_counter() - start
+        engine.shutdown()
+        print(f"{f'{workers} workers':>12}: {num_docs / elapsed:8.1f} docs/sec")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 12,
+    )
@@ -0,0 +1,138 @@
+# Benchmark: memory of one POST /partner/shortlist over a large batch of resumes, in a
+# fresh interpreter per configuration. Reports the service process's peak RSS above its
+# post-startup baseline, scaled to 1,000 resumes, and the Python heap peak (tracemalloc).
+# Extraction runs in worker processes, so parser memory is not included.
+# Uses the offline stand-ins from offline.py (fake Bedrock, moto S3, mongomock-motor).
+# Linux only (peak RSS is read from /proc/self/status after resetting it via clear_refs).
+# Requires: pip install "moto[s3]>=5" mongomock-motor
+# Run from ai-backend/:  python benchmarks/bench_memory.py [--resumes 1000] [--pages 2]
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import offline  # noqa: E402
+
+# Environment overrides per configuration
+CONFIGS = {
+    "persist text": {"SHORTLIST_PERSIST_TEXT": "true"},
+    "drop text": {"SHORTLIST_PERSIST_TEXT": "false"},
+}
+
+
+def status_mb(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def reset_peak_rss():
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+
+
+# Generate and upload one resume at a time so the corpus is never held in this process
+def upload_corpus(count, pages, seed):
+    import corpus
+    from s3_resumes import get_s3_client
+
+    rng = random.Random(seed)
+    s3 = get_s3_client()
+    urls = []
+    for i in range(count):
+        urls += offline.upload_resumes(s3, [(f"resume_{i}.pdf", corpus.make_pdf(corpus.resume_pages(rng, i, pages)))])
+    return urls
+
+
+# Runs inside the child interpreter and prints one JSON line of measurements
+def child(args):
+    offline.configure_environment()
+    # Models, pools and clients are loaded before the baseline is taken
+    os.environ["STARTUP_WARMUP"] = "blocking"
+    s3_mock = offline.start_s3()
+    offline.use_mock_mongo()
+
+    import httpx
+    import partner
+
+    partner.bedrock_gateway.client = offline.fake_bedrock_client(latency=0.0)
+    urls = upload_corpus(args.resumes, args.pages, args.seed)
+
+    async def run():
+        async with partner.app.router.lifespan_context(partner.app):
+            transport = httpx.ASGITransport(app=partner.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+                gc.collect()
+                baseline = status_mb("VmRSS")
+                reset_peak_rss()
+                tracemalloc.start()
+                start = time.perf_counter()
+                response = await client.post("/partner/shortlist", data={
+                    "internship_id": str(partner.ObjectId()),
+                    "job_description": "Backend developer with Python, Django and AWS",
+                    "job_skills": '["python", "django", "aws", "docker"]',
+                    "resumes": urls,
+                })
+                response.raise_for_status()
+                elapsed = time.perf_counter() - start
+                heap_peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+                tracemalloc.stop()
+                return {
+                    "baseline_mb": baseline,
+                    "peak_mb": status_mb("VmHWM"),
+                    "heap_peak_mb": heap_peak,
+                    "seconds": elapsed,
+                    "shortlisted": len(response.json()["shortlisted_candidates"]),
+                    "response_kb": len(response.content) / 1024,
+                }
+
+    try:
+        print(json.dumps(asyncio.run(run())))
+    finally:
+        from extraction import extraction_engine
+
+        extraction_engine.shutdown()
+        if s3_mock is not None:
+            s3_mock.stop()
+
+
+def measure(args, overrides):
+    command = [sys.executable, os.path.abspath(__file__), "--child",
+               "--resumes", str(args.resumes), "--pages", str(args.pages), "--seed", str(args.seed)]
+    output = subprocess.run(
+        command, env={**os.environ, **overrides}, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(args):
+    print(f"{args.resumes} resumes x {args.pages} page(s), resume cache {os.getenv('RESUME_CACHE_SIZE', '512')} entries")
+    print(f"{'config':<14} {'baseline':>9} {'peak':>9} {'per 1k':>9} {'heap pk':>9} {'seconds':>8} {'resp KB':>8}  (MB)")
+    for name, overrides in CONFIGS.items():
+        r = measure(args, overrides)
+        per_thousand = (r["peak_mb"] - r["baseline_mb"]) * 1000 / args.resumes
+        print(f"{name:<14} {r['baseline_mb']:9.1f} {r['peak_mb']:9.1f} {per_thousand:9.1f} "
+              f"{r['heap_peak_mb']:9.1f} {r['seconds']:8.2f} {r['response_kb']:8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=1000, help="resumes in the shortlist request")
+    parser.add_argument("--pages", type=int, default=2, help="pages per resume")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args)
+    else:
+        main(args)
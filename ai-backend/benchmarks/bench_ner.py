@@ -0,0 +1,49 @@
+# Benchmark: spaCy NER docs/sec, full pipeline called once per resume (old path) vs
+# the trimmed ner-only pipeline over nlp.pipe batches.
+# Requires: python -m spacy download en_core_web_sm
+# Run from ai-backend/:  python benchmarks/bench_ner.py [num_docs] [n_process]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import spacy  # noqa: E402
+
+from ner import ENTITY_LABELS, extract_entities_batch, get_nlp  # noqa: E402
+
+RESUME = (
+    "Jane Doe, Bangalore, India. Software Engineer at Infosys (2019-2022) and Google (2022-present). "
+    "Built payment services for Flipkart with Python, Django and PostgreSQL on AWS. "
+    "B.Tech in Computer Science from IIT Madras. Interned at Microsoft Research in Hyderabad. "
+) * 12
+
+
+def per_call(nlp, texts):
+    return [[ent.text for ent in nlp(text).ents if ent.label_ in ENTITY_LABELS] for text in texts]
+
+
+def main(num_docs, n_process):
+    texts = [f"Candidate {i}. {RESUME}" for i in range(num_docs)]
+    model = os.getenv("SPACY_MODEL", "en_core_web_sm")
+
+    full = spacy.load(model)
+    start = time.perf_counter()
+    baseline = per_call(full, texts)
+    elapsed = time.perf_counter() - start
+    print(f"{'per-call, full pipeline':>28}: {num_docs / elapsed:8.1f} docs/sec  {full.pipe_names}")
+
+    trimmed = get_nlp()
+    start = time.perf_counter()
+    batched = extract_entities_batch(texts, batch_size=64, n_process=n_process)
+    elapsed = time.perf_counter() - start
+    print(f"{f'nlp.pipe, ner only, n_process={n_process}':>28}: {num_docs / elapsed:8.1f} docs/sec  {trimmed.pipe_names}")
+
+    assert batched == baseline, "trimmed pipeline produced different entities"
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1,
+    )
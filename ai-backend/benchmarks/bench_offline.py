@@ -0,0 +1,193 @@
+# Offline load test for both AI services: micro stages and full endpoints, with a fake
+# Bedrock, in-process S3 and in-memory MongoDB (see offline.py) and a synthetic resume
+# corpus (see corpus.py). Reports throughput and p50/p95/p99 latency per benchmark, so
+# regressions show up without network access or AWS credentials.
+# Requires: pip install "moto[s3]>=5" mongomock-motor
+# Run from ai-backend/:  python benchmarks/bench_offline.py [--resumes 100] [--concurrency 8] ...
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import corpus  # noqa: E402
+import offline  # noqa: E402
+
+
+# Run fn over items with at most `concurrency` in flight; returns results, latencies, wall time
+async def measure(fn, items, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def run(item):
+        async with semaphore:
+            start = time.perf_counter()
+            result = await fn(item)
+            latencies.append(time.perf_counter() - start)
+            return result
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[run(item) for item in items])
+    return results, latencies, time.perf_counter() - start
+
+
+def measure_sync(fn, items):
+    latencies = []
+    start = time.perf_counter()
+    for item in items:
+        item_start = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - item_start)
+    return latencies, time.perf_counter() - start
+
+
+def chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+async def bench_stages(args, resumes, urls):
+    import main
+    import partner
+    from extraction import extraction_engine
+    from ner import entity_batcher
+    from similarity_index import SimilarityIndex
+
+    print("-- micro stages")
+    texts, latencies, elapsed = await measure(
+        lambda resume: extraction_engine.extract(resume[1], resume[0]), resumes, args.concurrency
+    )
+    offline.report("extract (pdf/docx)", latencies, elapsed)
+
+    offline.report("skill_match", *measure_sync(main.match_known_skills, texts))
+
+    _, latencies, elapsed = await measure(entity_batcher.extract, texts, args.concurrency)
+    offline.report(f"ner ({os.getenv('SPACY_MODEL', 'en_core_web_sm')})", latencies, elapsed)
+
+    def tfidf(batch):
+        index = SimilarityIndex()
+        index.add([f"doc{i}" for i in range(len(batch))], batch)
+        index.scores("Backend developer with Python, Django and AWS")
+    offline.report(f"tfidf add+score x{args.shortlist_size}",
+                   *measure_sync(tfidf, chunks(texts, args.shortlist_size)))
+
+    _, latencies, elapsed = await measure(partner.resume_downloader.download_async, urls, args.concurrency)
+    offline.report("s3 download", latencies, elapsed)
+
+    prompts = [f"Evaluate this resume out of 100.\n{text[:500]}" for text in texts]
+    _, latencies, elapsed = await measure(main.invoke_bedrock, prompts, args.concurrency)
+    offline.report("bedrock gateway (fake)", latencies, elapsed)
+
+
+async def bench_endpoints(args, resumes, urls):
+    import httpx
+    import main
+    import partner
+
+    print("-- endpoints")
+    job_skills = ["python", "docker", "kubernetes", "react", "sql", "aws", "graphql", "terraform"]
+
+    def analyze_form(resume):
+        name, data = resume
+        return {
+            "files": {"file": (name, data)},
+            "data": {"job_description": "Backend developer",
+                     "required_skills": ",".join(random.sample(job_skills, 4))},
+        }
+
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            async def analyze(resume):
+                response = await client.post("/analyze-skills/", **analyze_form(resume))
+                response.raise_for_status()
+
+            async def analyze_stream(resume):
+                response = await client.post("/analyze-skills/stream", **analyze_form(resume))
+                response.raise_for_status()
+
+            _, latencies, elapsed = await measure(analyze, resumes, args.concurrency)
+            offline.report("POST /analyze-skills/", latencies, elapsed)
+            # Second pass over the same files: resume and skill-gap caches are warm
+            _, latencies, elapsed = await measure(analyze_stream, resumes, args.concurrency)
+            offline.report("POST /analyze-skills/stream", latencies, elapsed)
+
+    async with partner.app.router.lifespan_context(partner.app):
+        await partner.applications_collection.insert_many([
+            {"resumeUrl": url, "userName": f"Student {i}", "userEmail": f"s{i}@example.com", "job_id": "bench"}
+            for i, url in enumerate(urls)
+        ])
+        transport = httpx.ASGITransport(app=partner.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            internship_ids = [partner.ObjectId() for _ in range(args.shortlists)]
+
+            async def shortlist(internship_id):
+                response = await client.post("/partner/shortlist", data={
+                    "internship_id": str(internship_id),
+                    "job_description": "Backend developer with Python, Django and AWS",
+                    "job_skills": '["python", "django", "aws", "docker"]',
+                    "resumes": random.sample(urls, min(args.shortlist_size, len(urls))),
+                })
+                response.raise_for_status()
+
+            async def shortlisted(internship_id):
+                response = await client.get(f"/partner/shortlisted/{internship_id}")
+                response.raise_for_status()
+
+            _, latencies, elapsed = await measure(shortlist, internship_ids, args.concurrency)
+            offline.report(f"POST /partner/shortlist x{args.shortlist_size}", latencies, elapsed)
+            _, latencies, elapsed = await measure(shortlisted, internship_ids, args.concurrency)
+            offline.report("GET /partner/shortlisted", latencies, elapsed)
+
+
+def main(args):
+    offline.configure_environment()
+    s3_mock = offline.start_s3()
+    offline.use_mock_mongo()
+
+    import main as analyze_service
+    import partner
+    from s3_resumes import get_s3_client
+
+    random.seed(args.seed)
+    for service in (analyze_service, partner):
+        service.bedrock_gateway.client = offline.fake_bedrock_client(args.bedrock_latency, args.throttle_rate)
+
+    resumes = corpus.generate(args.resumes, args.pages, seed=args.seed)
+    # The shortlist reads PDFs only
+    urls = offline.upload_resumes(get_s3_client(), [(name, data) for name, data in resumes if name.endswith(".pdf")])
+    print(f"{len(resumes)} resumes x {args.pages} page(s), concurrency {args.concurrency}, "
+          f"fake Bedrock {args.bedrock_latency * 1000:.0f} ms / {args.throttle_rate:.0%} throttled, "
+          f"S3 {os.getenv('S3_ENDPOINT_URL') or 'moto'}, MongoDB {os.getenv('BENCH_MONGO_URI') or 'mongomock'}")
+
+    async def run():
+        if not args.skip_stages:
+            await bench_stages(args, resumes, urls)
+        if not args.skip_endpoints:
+            await bench_endpoints(args, resumes, urls)
+
+    try:
+        asyncio.run(run())
+    finally:
+        from extraction import extraction_engine
+
+        extraction_engine.shutdown()
+        if s3_mock is not None:
+            s3_mock.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=100, help="synthetic resumes to generate")
+    parser.add_argument("--pages", type=int, default=1, help="pages per resume")
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight")
+    parser.add_argument("--bedrock-latency", type=float, default=0.2, help="fake Bedrock latency (s)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of fake Bedrock calls throttled")
+    parser.add_argument("--shortlists", type=int, default=10, help="POST /partner/shortlist requests")
+    parser.add_argument("--shortlist-size", type=int, default=20, help="resumes per shortlist request")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-stages", action="store_true")
+    parser.add_argument("--skip-endpoints", action="store_true")
+    main(parser.parse_args())
@@ -0,0 +1,86 @@
+# Benchmark: per-resume download overhead, new client per file (old path) vs the
+# pooled ResumeDownloader. Uses moto's in-process S3 unless S3_ENDPOINT_URL points
+# at a local MinIO. Requires: pip install "moto[s3]>=5"
+# Run from ai-backend/:  python benchmarks/bench_s3_download.py [num_files]
+import asyncio
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import boto3  # type: ignore  # noqa: E402
+
+from s3_resumes import ResumeDownloader, parse_s3_url  # noqa: E402
+
+BUCKET = "bench-resumes"
+FILE_SIZE = 200 * 1024
+
+
+def s3_client():
+    return boto3.client(
+        "s3",
+        region_name="us-east-1",
+        aws_access_key_id=os.getenv("Resume_AWS_ACCESS_KEY_ID", "bench"),
+        aws_secret_access_key=os.getenv("Resume_AWS_SECRET_ACCESS_KEY", "bench"),
+        endpoint_url=os.getenv("S3_ENDPOINT_URL") or None,
+    )
+
+
+def seed(num_files):
+    s3 = s3_client()
+    s3.create_bucket(Bucket=BUCKET)
+    payload = os.urandom(FILE_SIZE)
+    urls = []
+    for i in range(num_files):
+        key = f"resumes/{i}.pdf"
+        s3.put_object(Bucket=BUCKET, Key=key, Body=payload)
+        urls.append(f"https://{BUCKET}.s3.amazonaws.com/{key}")
+    return urls
+
+
+# The previous download_resume_from_s3: a fresh client and download_fileobj per resume
+def legacy_download(resume_url):
+    bucket, key = parse_s3_url(resume_url)
+    buf = io.BytesIO()
+    s3_client().download_fileobj(bucket, key, buf)
+    return buf.getvalue()
+
+
+async def run_legacy(urls):
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor() as pool:
+        return await asyncio.gather(*[loop.run_in_executor(pool, legacy_download, url) for url in urls])
+
+
+async def run_pooled(urls):
+    client = s3_client()
+    downloader = ResumeDownloader(client_factory=lambda: client, max_concurrency=16)
+    return await asyncio.gather(*[downloader.download_async(url) for url in urls])
+
+
+def report(name, elapsed, results, num_files):
+    assert all(len(r) == FILE_SIZE for r in results), f"{name}: incomplete downloads"
+    print(f"{name:>8}: {elapsed:7.2f}s total, {elapsed * 1000 / num_files:7.2f} ms/resume")
+
+
+def main(num_files):
+    urls = seed(num_files)
+    print(f"Downloading {num_files} resumes of {FILE_SIZE // 1024} KiB")
+    for name, runner in (("legacy", run_legacy), ("pooled", run_pooled)):
+        start = time.perf_counter()
+        results = asyncio.run(runner(urls))
+        report(name, time.perf_counter() - start, results, num_files)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    if os.getenv("S3_ENDPOINT_URL"):
+        main(count)
+    else:
+        from moto import mock_aws  # type: ignore
+
+        with mock_aws():
+            main(count)
@@ -0,0 +1,91 @@
+# Benchmark: cold start of each service under each STARTUP_WARMUP mode, in a fresh
+# interpreter per run: module import time, lifespan startup, time until /readyz is 200,
+# and the latency of the first /healthz and the first real request.
+# Uses the offline stand-ins from offline.py (fake Bedrock, moto S3, mongomock-motor).
+# Requires: pip install "moto[s3]>=5" mongomock-motor
+# Run from ai-backend/:  python benchmarks/bench_startup.py [runs]
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import offline  # noqa: E402
+
+MODES = ["lazy", "background", "blocking"]
+
+
+# First real request for each service: one that touches the heavy resources
+async def first_request(service_name, client):
+    if service_name == "main":
+        import corpus
+
+        name, data = corpus.generate(1)[0]
+        return await client.post("/analyze-skills/", files={"file": (name, data)},
+                                 data={"job_description": "Backend developer", "required_skills": "python,docker"})
+    return await client.post("/partner/similarity/64b7f0c2a1b2c3d4e5f6a7b8",
+                             data={"job_description": "Backend developer", "k": 5})
+
+
+# Runs inside the child interpreter and prints one JSON line of timings
+def child(service_name):
+    offline.configure_environment()
+    offline.start_s3()
+    offline.use_mock_mongo()
+
+    start = time.perf_counter()
+    service = __import__(service_name)
+    timings = {"import": time.perf_counter() - start}
+    service.bedrock_gateway.client = offline.fake_bedrock_client(latency=0.0)
+
+    async def run():
+        import httpx
+
+        start = time.perf_counter()
+        async with service.app.router.lifespan_context(service.app):
+            timings["lifespan_startup"] = time.perf_counter() - start
+            transport = httpx.ASGITransport(app=service.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+                request_start = time.perf_counter()
+                (await client.get("/healthz")).raise_for_status()
+                timings["first_healthz"] = time.perf_counter() - request_start
+
+                while (await client.get("/readyz")).status_code != 200:
+                    await asyncio.sleep(0.01)
+                timings["ready"] = time.perf_counter() - start
+
+                request_start = time.perf_counter()
+                (await first_request(service_name, client)).raise_for_status()
+                timings["first_request"] = time.perf_counter() - request_start
+
+    asyncio.run(run())
+    print(json.dumps(timings))
+
+
+def measure(service_name, mode):
+    env = {**os.environ, "STARTUP_WARMUP": mode}
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", service_name],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(runs):
+    print(f"{'service':<8} {'mode':<11} {'import':>8} {'startup':>8} {'healthz':>8} {'ready':>8} {'1st req':>8}  (s, median of {runs})")
+    for service_name in ("main", "partner"):
+        for mode in MODES:
+            results = [measure(service_name, mode) for _ in range(runs)]
+            median = {key: sorted(r[key] for r in results)[len(results) // 2] for key in results[0]}
+            print(f"{service_name:<8} {mode:<11} {median['import']:8.3f} {median['lifespan_startup']:8.3f} "
+                  f"{median['first_healthz']:8.3f} {median['ready']:8.3f} {median['first_request']:8.3f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        child(sys.argv[2])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
@@ -0,0 +1,90 @@
+# Synthetic resume corpus: PDF and DOCX resumes with a random mix of known skills,
+# organisations and filler text, reproducible from a seed.
+# Run from ai-backend/:  python benchmarks/corpus.py OUT_DIR [count] [pages]
+import io
+import os
+import random
+import sys
+
+import docx  # type: ignore
+import fitz  # type: ignore
+
+SKILLS = [
+    "Python", "Java", "JavaScript", "React", "Node.js", "Django", "Flask", "C++", "SQL",
+    "PostgreSQL", "MongoDB", "HTML", "CSS", "AWS", "Azure", "Docker", "Kubernetes",
+    "TensorFlow", "Pandas", "NumPy", "Git", "Agile", "Scrum", "Jira", "REST API", "GraphQL",
+    "Machine Learning", "Express.js", "Figma", "Excel", "Tableau", "Go", "Rust", "Terraform",
+]
+ORGS = ["Infosys", "Google", "Amazon", "Accenture", "IIT Madras", "Stanford University", "TCS", "Wipro"]
+PLACES = ["Hyderabad", "Bangalore", "Chennai", "London", "New York", "Berlin"]
+FILLER = (
+    "Worked with cross-functional teams to design, build and ship features, wrote tests, "
+    "reviewed code and improved the reliability and performance of production services."
+)
+
+
+# Text of one resume, as a list of pages of lines
+def resume_pages(rng, index, pages=1, lines_per_page=30):
+    skills = rng.sample(SKILLS, rng.randint(4, 12))
+    header = [
+        f"Candidate {index}",
+        f"candidate{index}@example.com | {rng.choice(PLACES)}",
+        "Skills: " + ", ".join(skills),
+    ]
+    result = []
+    for page in range(pages):
+        lines = list(header) if page == 0 else []
+        while len(lines) < lines_per_page:
+            lines.append(f"{rng.choice(ORGS)}, {rng.choice(PLACES)}: used {rng.choice(skills)}. {FILLER}")
+        result.append(lines)
+    return result
+
+
+def make_pdf(pages):
+    doc = fitz.open()
+    for lines in pages:
+        page = doc.new_page()
+        # insert_textbox writes nothing (and returns a negative number) when the text overflows
+        if page.insert_textbox(page.rect + (40, 40, -40, -40), "\n".join(lines), fontsize=8) < 0:
+            raise ValueError("resume page text does not fit on a PDF page")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def make_docx(pages):
+    document = docx.Document()
+    for lines in pages:
+        for line in lines:
+            document.add_paragraph(line)
+        document.add_page_break()
+    buf = io.BytesIO()
+    document.save(buf)
+    return buf.getvalue()
+
+
+# (filename, bytes) pairs; every docx_every-th resume is a DOCX, the rest are PDFs
+def generate(count, pages=1, docx_every=4, seed=42):
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(count):
+        content = resume_pages(rng, i, pages)
+        if docx_every and i % docx_every == docx_every - 1:
+            corpus.append((f"resume_{i}.docx", make_docx(content)))
+        else:
+            corpus.append((f"resume_{i}.pdf", make_pdf(content)))
+    return corpus
+
+
+def main(out_dir, count, pages):
+    os.makedirs(out_dir, exist_ok=True)
+    for name, data in generate(count, pages):
+        with open(os.path.join(out_dir, name), "wb") as f:
+            f.write(data)
+    print(f"Wrote {count} resumes ({pages} page(s) each) to {out_dir}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit("usage: python benchmarks/corpus.py OUT_DIR [count] [pages]")
+    main(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 100, int(sys.argv[3]) if len(sys.argv) > 3 else 1)
@@ -0,0 +1,108 @@
+# Local stand-ins for the services' external dependencies, for benchmarks that must run
+# without network access or AWS credentials:
+#   Bedrock  -> StubBedrockClient with canned answers, configurable latency and throttling
+#   S3       -> moto's in-process S3, or MinIO/localstack when S3_ENDPOINT_URL is set
+#   MongoDB  -> mongomock-motor, or a local mongod when BENCH_MONGO_URI is set
+# Requires: pip install "moto[s3]>=5" mongomock-motor
+import json
+import math
+import os
+import random
+import tempfile
+
+from bedrock_gateway import StubBedrockClient
+
+BUCKET = "bench-resumes"
+
+
+# Canned model output shaped like each prompt the services send
+def fake_bedrock_responder(prompt):
+    if "quiz" in prompt:
+        return json.dumps([
+            {"question": f"Question {i} about the topic?", "options": ["A. one", "B. two", "C. three", "D. four"],
+             "answer": "B"}
+            for i in range(3)
+        ])
+    if "online courses" in prompt:
+        return "\n".join(f"Coursera: Course {i}" for i in range(3))
+    if "Evaluate this resume" in prompt:
+        return str(random.randint(40, 95))
+    return "Python, Docker, SQL, React, Git"
+
+
+def fake_bedrock_client(latency=0.2, throttle_rate=0.0):
+    return StubBedrockClient(fake_bedrock_responder, latency=latency, throttle_rate=throttle_rate)
+
+
+# Environment for importing main.py / partner.py offline. Must run before they are imported;
+# values already set in the environment win, so a local mongod or MinIO can be used instead.
+def configure_environment():
+    defaults = {
+        "AWS_ACCESS_KEY_ID": "bench", "AWS_SECRET_ACCESS_KEY": "bench", "AWS_REGION": "us-east-1",
+        "Resume_AWS_ACCESS_KEY_ID": "bench", "Resume_AWS_SECRET_ACCESS_KEY": "bench",
+        "Resume_AWS_REGION": "us-east-1",
+        "SIMILARITY_INDEX_DIR": tempfile.mkdtemp(prefix="bench-similarity-"),
+        "SHORTLIST_JOB_STORE": "memory",
+        "LOG_LEVEL": "WARNING",
+        # No client-side rate limit unless asked for, so the numbers measure the services
+        "BEDROCK_RATE_PER_SEC": "0",
+    }
+    for key, value in defaults.items():
+        os.environ.setdefault(key, value)
+    if os.getenv("BENCH_MONGO_URI"):
+        os.environ["MONGO_URI"] = os.environ["BENCH_MONGO_URI"]
+    if not os.getenv("SPACY_MODEL"):
+        import spacy
+
+        if not spacy.util.is_package("en_core_web_sm"):
+            # Without the trained model NER runs through an empty pipeline (tokenization only)
+            os.environ["SPACY_MODEL"] = "blank:en"
+
+
+# In-process S3 unless S3_ENDPOINT_URL points at a real S3-compatible server
+def start_s3():
+    if os.getenv("S3_ENDPOINT_URL"):
+        return None
+    from moto import mock_aws  # type: ignore
+
+    mock = mock_aws()
+    mock.start()
+    return mock
+
+
+# In-memory MongoDB unless BENCH_MONGO_URI is set; must run before partner.py is imported
+def use_mock_mongo():
+    if os.getenv("BENCH_MONGO_URI"):
+        return
+    import database
+    from mongomock_motor import AsyncMongoMockClient  # type: ignore
+
+    client = AsyncMongoMockClient()
+    database.get_database = lambda uri=None: client["skillnaav_bench"]
+
+
+def upload_resumes(s3, corpus):
+    if BUCKET not in [bucket["Name"] for bucket in s3.list_buckets()["Buckets"]]:
+        s3.create_bucket(Bucket=BUCKET)
+    urls = []
+    for name, data in corpus:
+        s3.put_object(Bucket=BUCKET, Key=name, Body=data)
+        urls.append(f"https://{BUCKET}.s3.amazonaws.com/{name}")
+    return urls
+
+
+def percentile(sorted_samples, p):
+    if not sorted_samples:
+        return float("nan")
+    return sorted_samples[max(0, math.ceil(p / 100 * len(sorted_samples)) - 1)]
+
+
+# One line per benchmark: operations, throughput and latency percentiles in ms
+def report(name, latencies, elapsed):
+    samples = sorted(latencies)
+    throughput = len(samples) / elapsed if elapsed else float("nan")
+    print(
+        f"{name:<28} n={len(samples):<5} {throughput:9.1f} ops/s  "
+        f"p50 {percentile(samples, 50) * 1000:9.1f}  p95 {percentile(samples, 95) * 1000:9.1f}  "
+        f"p99 {percentile(samples, 99) * 1000:9.1f} ms"
+    )
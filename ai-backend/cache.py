@@ -0,0 +1,206 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+# Thread-safe LRU cache with optional per-entry TTL
+class LRUCache:
+    def __init__(self, max_entries=512, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+# Cache of parsed resumes (text, spaCy entities, skills) keyed by content hash or S3 ETag.
+# Entries live in memory with LRU eviction; if disk_dir is set they are also written
+# there as JSON so other workers and restarts can reuse them. Disk entries expire after
+# disk_ttl seconds, and the directory is pruned, least recently used first, to
+# max_disk_bytes every prune_every writes. Disk I/O runs in worker threads.
+class ResumeCache:
+    def __init__(self, max_entries=512, disk_dir=None, max_disk_bytes=256 * 1024 * 1024,
+                 disk_ttl=7 * 24 * 3600, prune_every=100):
+        self.memory = LRUCache(max_entries=max_entries)
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.disk_ttl = disk_ttl
+        self.prune_every = prune_every
+        self._writes = 0
+        self._prune_lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_entries=int(os.getenv("RESUME_CACHE_SIZE", "512")),
+            disk_dir=os.getenv("RESUME_CACHE_DIR") or None,
+            max_disk_bytes=int(float(os.getenv("RESUME_CACHE_DISK_MAX_MB", "256")) * 1024 * 1024),
+            disk_ttl=float(os.getenv("RESUME_CACHE_DISK_TTL", str(7 * 24 * 3600))) or None,
+        )
+
+    @staticmethod
+    def key_for_bytes(data):
+        return "sha256:" + hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def key_for_etag(etag):
+        return "etag:" + etag.strip('"')
+
+    def _disk_path(self, key):
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir, f"{name}.json")
+
+    async def get(self, key):
+        entry = self.memory.get(key)
+        if entry is not None or not self.disk_dir:
+            return entry
+        entry = await asyncio.to_thread(self._read_disk, key)
+        if entry is not None:
+            self.memory.put(key, entry)
+        return entry
+
+    # Merge fields into the entry for key, e.g. store text first and skills later
+    async def update(self, key, **fields):
+        entry = dict(await self.get(key) or {})
+        entry.update(fields)
+        self.memory.put(key, entry)
+        if self.disk_dir:
+            await asyncio.to_thread(self._write_disk, key, entry)
+        return entry
+
+    # A hit refreshes the file's mtime, which orders eviction; expired files are removed
+    def _read_disk(self, key):
+        path = self._disk_path(key)
+        try:
+            if self.disk_ttl and os.path.getmtime(path) < time.time() - self.disk_ttl:
+                os.remove(path)
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+            return entry
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Resume cache read error for {key}: {e}")
+            return None
+
+    def _write_disk(self, key, entry):
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Resume cache write error for {key}: {e}")
+            return
+        self._writes += 1
+        if (self._writes - 1) % self.prune_every == 0:
+            self.prune()
+
+    # Remove expired entries, then the least recently used ones until the directory fits
+    # max_disk_bytes; safe to run from several processes at once
+    def prune(self):
+        if not self.disk_dir or not self._prune_lock.acquire(blocking=False):
+            return
+        try:
+            files = []
+            expired_before = time.time() - self.disk_ttl if self.disk_ttl else None
+            with os.scandir(self.disk_dir) as entries:
+                for item in entries:
+                    if not item.name.endswith(".json"):
+                        continue
+                    try:
+                        stat = item.stat()
+                    except FileNotFoundError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, item.path))
+            files.sort()
+            total = sum(size for _, size, _ in files)
+            removed = 0
+            for mtime, size, path in files:
+                if (expired_before is None or mtime >= expired_before) and total <= self.max_disk_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+                total -= size
+            if removed:
+                logger.info(f"Resume cache pruned {removed} disk entries ({total} bytes kept)")
+        finally:
+            self._prune_lock.release()
+
+
+# Cache of LLM output (course recommendations, quizzes) keyed by the sorted skill-gap set,
+# so students sharing the same gaps are served without another model call.
+class SkillGapCache:
+    def __init__(self, max_entries=1024, ttl=6 * 3600):
+        self.memory = LRUCache(max_entries=max_entries, ttl=ttl)
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_entries=int(os.getenv("SKILL_GAP_CACHE_SIZE", "1024")),
+            ttl=float(os.getenv("SKILL_GAP_CACHE_TTL", str(6 * 3600))),
+        )
+
+    @staticmethod
+    def key_for_gaps(skill_gaps):
+        return "|".join(sorted({gap.lower().strip() for gap in skill_gaps}))
+
+    def get(self, kind, skill_gaps):
+        return self.memory.get((kind, self.key_for_gaps(skill_gaps)))
+
+    def put(self, kind, skill_gaps, value):
+        self.memory.put((kind, self.key_for_gaps(skill_gaps)), value)
+
+
+resume_cache = ResumeCache.from_env()
+skill_gap_cache = SkillGapCache.from_env()
@@ -0,0 +1,105 @@
+import hashlib
+import os
+import tempfile
+import threading
+from dataclasses import dataclass, field
+
+
+# Location of one resume text in a TextSpool (UTF-8 bytes at offset..offset+length)
+@dataclass(frozen=True, slots=True)
+class TextRef:
+    digest: str
+    offset: int
+    length: int
+
+
+# Append-only temporary store for the resume text of one shortlist run, so candidate
+# records carry a small TextRef instead of the text itself. Small runs stay in memory;
+# past max_memory bytes the spool rolls over to an anonymous temporary file (deleted on
+# close) under TEXT_SPOOL_DIR or the system temp directory. Identical texts are stored once.
+class TextSpool:
+    def __init__(self, max_memory=1 << 20, directory=None):
+        self._file = tempfile.SpooledTemporaryFile(max_size=max_memory, dir=directory)
+        self._refs = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_memory=int(os.getenv("TEXT_SPOOL_MAX_MEMORY", str(1 << 20))),
+            directory=os.getenv("TEXT_SPOOL_DIR") or None,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+            self._refs.clear()
+
+    @property
+    def size(self):
+        return self._size
+
+    def put(self, text):
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            ref = self._refs.get(digest)
+            if ref is None:
+                self._file.seek(self._size)
+                self._file.write(data)
+                ref = TextRef(digest, self._size, len(data))
+                self._refs[digest] = ref
+                self._size += len(data)
+        return ref
+
+    # Text for a ref; max_chars reads only as much as a prompt snippet needs
+    def get(self, ref, max_chars=None):
+        length = ref.length if max_chars is None else min(ref.length, max_chars * 4)
+        with self._lock:
+            self._file.seek(ref.offset)
+            data = self._file.read(length)
+        text = data.decode("utf-8", errors="ignore")
+        return text if max_chars is None else text[:max_chars]
+
+    # One text at a time, e.g. straight into a vectorizer
+    def iter_texts(self, refs):
+        for ref in refs:
+            yield self.get(ref)
+
+
+# Compact per-resume record for the shortlist pipeline: scores and metadata only, the
+# text stays in the run's TextSpool. Field names map to the shortlist document's keys
+# in to_document.
+@dataclass(slots=True)
+class Candidate:
+    resume_url: str
+    text_ref: TextRef
+    skills: list
+    applicant: dict = field(default_factory=dict)
+    readiness_score: int | None = None
+    similarity_score: float | None = None
+    prefilter_score: float | None = None
+    shortlist_id: object = None
+
+    # Shortlist document; text is included only when given
+    def to_document(self, internship_id=None, text=None):
+        document = {**self.applicant, "resumeUrl": self.resume_url, "readiness_score": self.readiness_score}
+        if text is not None:
+            document["text"] = text
+        document["skills"] = self.skills
+        if self.similarity_score is not None:
+            document["similarity_score"] = self.similarity_score
+        if self.prefilter_score is not None:
+            document["prefilter_score"] = self.prefilter_score
+        if internship_id is not None:
+            document["internship_id"] = internship_id
+        if self.shortlist_id is not None:
+            document["_id"] = self.shortlist_id
+        return document
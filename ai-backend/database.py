@@ -0,0 +1,64 @@
+import os
+import threading
+
+from motor.motor_asyncio import AsyncIOMotorClient  # type: ignore
+from pymongo import WriteConcern
+
+
+# Native async MongoDB client; the connection pool is sized from the environment
+def get_database(uri=None):
+    client = AsyncIOMotorClient(
+        uri or os.getenv("MONGO_URI"),
+        maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", "100")),
+        minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", "0")),
+        maxIdleTimeMS=int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000")),
+        waitQueueTimeoutMS=int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "10000")),
+        serverSelectionTimeoutMS=int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000")),
+    )
+    return client.get_default_database()
+
+
+_database = None
+_database_lock = threading.Lock()
+
+
+# Process-wide database handle, created on first use rather than at import so no client
+# (and none of its monitor threads) exists before the server forks its workers
+def shared_database():
+    global _database
+    if _database is None:
+        with _database_lock:
+            if _database is None:
+                _database = get_database()
+    return _database
+
+
+# Collection that resolves the shared database the first time it is used
+class LazyCollection:
+    def __init__(self, name, **options):
+        self.name = name
+        self.options = options
+        self._collection = None
+
+    def __getattr__(self, attr):
+        if self._collection is None:
+            self._collection = shared_database().get_collection(self.name, **self.options)
+        return getattr(self._collection, attr)
+
+
+# Write concern for bulk shortlist writes. Shortlists can be recomputed, so by default
+# a write is acknowledged by the primary without waiting for the journal.
+def bulk_write_concern():
+    w = os.getenv("MONGO_BULK_WRITE_W", "1")
+    journal = os.getenv("MONGO_BULK_WRITE_JOURNAL", "false").lower() == "true"
+    return WriteConcern(w=int(w) if w.isdigit() else w, j=journal)
+
+
+BULK_WRITE_BATCH_SIZE = int(os.getenv("MONGO_BULK_WRITE_BATCH_SIZE", "500"))
+
+
+# Unordered bulk writes in fixed-size batches, so one huge shortlist does not become
+# a single oversized command and a failed document does not stop the rest
+async def bulk_write_batched(collection, operations, batch_size=BULK_WRITE_BATCH_SIZE):
+    for start in range(0, len(operations), batch_size):
+        await collection.bulk_write(operations[start:start + batch_size], ordered=False)
@@ -0,0 +1,164 @@
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+
+# Raised when a document takes longer than the per-document timeout
+class ExtractionTimeoutError(Exception):
+    pass
+
+
+# --- Worker functions (run inside the process pool, so they must stay module-level) ---
+# The parsers are imported in the workers only; the server process never needs them.
+
+def _load_parsers():
+    import docx  # python-docx for DOCX files
+    import fitz  # PyMuPDF for PDFs
+
+    return os.getpid()
+
+
+def _extract_pdf_pages(data, start, stop):
+    import fitz
+
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return [doc[i].get_text("text") for i in range(start, min(stop, doc.page_count))]
+
+
+# First page range plus the total page count, so short documents need one round trip
+def _extract_pdf_head(data, pages_per_task):
+    import fitz
+
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return doc.page_count, [doc[i].get_text("text") for i in range(min(pages_per_task, doc.page_count))]
+
+
+def _extract_docx(data):
+    import docx
+
+    doc = docx.Document(io.BytesIO(data))
+    return "\n".join(para.text for para in doc.paragraphs)
+
+
+# CPU-bound PDF/DOCX text extraction on a process pool sized to the machine.
+# Short PDFs go to one worker; longer ones are split into page ranges across workers.
+# Documents are capped at max_pages. A parse cannot be interrupted inside its worker, so
+# when a document overruns timeout seconds the pool is recycled: its workers are killed
+# and other documents that were in flight on it are resubmitted to a fresh pool, as often
+# as needed within their own deadline. A pool broken by a crashing worker is replaced too,
+# and the documents on it are retried once.
+class ExtractionEngine:
+    def __init__(self, workers=None, pages_per_task=8, max_pages=50, timeout=30.0):
+        self.workers = workers or os.cpu_count() or 1
+        self.pages_per_task = pages_per_task
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.documents = 0
+        self.busy_seconds = 0.0
+        self._pool = None
+        self._timed_out_pools = weakref.WeakSet()
+
+    @classmethod
+    def from_env(cls, **overrides):
+        settings = {
+            "workers": int(os.getenv("EXTRACTION_WORKERS", "0")) or None,
+            "pages_per_task": int(os.getenv("EXTRACTION_PAGES_PER_TASK", "8")),
+            "max_pages": int(os.getenv("MAX_RESUME_PAGES", "50")),
+            "timeout": float(os.getenv("EXTRACTION_TIMEOUT", "30")),
+        }
+        settings.update(overrides)
+        return cls(**settings)
+
+    # Workers are spawned (not forked) so they never inherit the server's threads or sockets
+    @property
+    def pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    # Start every worker and import the parsers in it ahead of the first document
+    def warm_up(self):
+        for future in [self.pool.submit(_load_parsers) for _ in range(self.workers)]:
+            future.result()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    # Replace the pool and kill its workers; the executor then fails every future still
+    # pending on it with BrokenProcessPool
+    def _recycle(self, pool):
+        if self._pool is pool:
+            self._pool = None
+        for process in list((pool._processes or {}).values()):
+            process.kill()
+        pool.shutdown(wait=False)
+
+    # Run fn in the pool; the caller's deadline (_timed) bounds the retries
+    async def _run(self, fn, *args, crash_retries=1):
+        loop = asyncio.get_running_loop()
+        while True:
+            pool = self.pool
+            try:
+                return await loop.run_in_executor(pool, fn, *args)
+            except BrokenProcessPool:
+                if pool in self._timed_out_pools:
+                    continue  # recycled because another document timed out
+                # A worker died on its own (e.g. a crashing parse), maybe on another document
+                if pool is self._pool:
+                    self._recycle(pool)
+                if crash_retries <= 0:
+                    raise
+                crash_retries -= 1
+
+    async def extract(self, data, filename):
+        if filename.endswith(".pdf"):
+            return await self.extract_pdf(data)
+        if filename.endswith(".docx"):
+            return await self.extract_docx(data)
+        raise ValueError(f"Unsupported resume type: {filename}")
+
+    async def extract_pdf(self, data):
+        return await self._timed(self._extract_pdf(bytes(data)))
+
+    async def extract_docx(self, data):
+        return await self._timed(self._run(_extract_docx, bytes(data)))
+
+    async def _extract_pdf(self, data):
+        first = min(self.pages_per_task, self.max_pages)
+        page_count, head = await self._run(_extract_pdf_head, data, first)
+        pages = min(page_count, self.max_pages)
+        ranges = [(start, min(start + self.pages_per_task, pages))
+                  for start in range(first, pages, self.pages_per_task)]
+        chunks = [head] + await asyncio.gather(*[
+            self._run(_extract_pdf_pages, data, start, stop) for start, stop in ranges
+        ])
+        return "\n".join(text for chunk in chunks for text in chunk)
+
+    async def _timed(self, work):
+        start = time.perf_counter()
+        try:
+            return await asyncio.wait_for(work, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            if self._pool is not None:
+                logger.warning(f"Text extraction exceeded {self.timeout}s; recycling the extraction pool")
+                self._timed_out_pools.add(self._pool)
+                self._recycle(self._pool)
+            raise ExtractionTimeoutError(f"Text extraction exceeded {self.timeout}s")
+        finally:
+            self.documents += 1
+            self.busy_seconds += time.perf_counter() - start
+
+
+extraction_engine = ExtractionEngine.from_env()
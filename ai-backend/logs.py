@@ -0,0 +1,51 @@
+import json
+import logging
+import os
+import random
+
+# Fraction of large payloads (resume text, raw model output) logged at DEBUG
+PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.01"))
+PAYLOAD_PREVIEW_CHARS = 200
+
+
+def _jsonable(value):
+    return sorted(value, key=str) if isinstance(value, (set, frozenset)) else str(value)
+
+
+# One JSON object per line: timestamp, level, logger, event and the event's fields
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+            **getattr(record, "fields", {}),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=_jsonable)
+
+
+# LOG_LEVEL sets the level; LOG_FORMAT=text keeps plain log lines for local runs
+def configure_logging():
+    handler = logging.StreamHandler()
+    if os.getenv("LOG_FORMAT", "json") == "json":
+        handler.setFormatter(JsonFormatter())
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), handlers=[handler])
+
+
+# Log an event with structured fields. Nothing is formatted when the level is disabled,
+# and with sample_rate < 1 only that fraction of events is emitted.
+def log_event(logger, event, level=logging.INFO, sample_rate=1.0, **fields):
+    if not logger.isEnabledFor(level) or (sample_rate < 1 and random.random() >= sample_rate):
+        return
+    logger.log(level, event, extra={"fields": fields})
+
+
+# Large payloads are only logged at DEBUG, sampled, as their size and a short preview
+def log_payload(logger, event, payload, sample_rate=PAYLOAD_SAMPLE_RATE, **fields):
+    if not logger.isEnabledFor(logging.DEBUG) or random.random() >= sample_rate:
+        return
+    text = payload if isinstance(payload, str) else str(payload)
+    logger.debug(event, extra={"fields": {**fields, "chars": len(text), "preview": text[:PAYLOAD_PREVIEW_CHARS]}})
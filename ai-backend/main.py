@@ -1,39 +1,54 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException, Form
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+import asyncio
 import os
-import fitz  # PyMuPDF for PDFs
-import docx  # python-docx for DOCX files
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 import logging
-import spacy
-import boto3 # type: ignore
 from dotenv import load_dotenv
-import time
 import json
 import re
 import traceback  # For error logging
+from contextlib import asynccontextmanager
 from datetime import datetime  # For timestamp utility
+from cache import ResumeCache, resume_cache, skill_gap_cache
+from bedrock_gateway import BedrockGateway
+from skill_matcher import SkillMatcher, compact_skill_name
+from extraction import extraction_engine
+from logs import configure_logging, log_event, log_payload
+from metrics import instrument, observe_bedrock_call, register_cache, register_gateway, stage, timed
+from resources import ResourceManager, add_health_routes
 
 # Load environment variables
 load_dotenv()
-aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID")
-aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY")
-aws_region = os.getenv("AWS_REGION")
-if not all([aws_access_key_id, aws_secret_access_key, aws_region]):
-    raise ValueError("Missing AWS credentials or region. Check your .env file!")
-
-# Initialize Bedrock client
-bedrock_client = boto3.client(
-    service_name="bedrock-runtime",
-    region_name=aws_region,
-    aws_access_key_id=aws_access_key_id,
-    aws_secret_access_key=aws_secret_access_key
+
+# Bedrock gateway; the bedrock-runtime client is created on the first model call
+bedrock_gateway = BedrockGateway.from_env(
+    None, "meta.llama3-8b-instruct-v1:0", on_call=observe_bedrock_call
 )
 
-# Logging
-logging.basicConfig(level=logging.INFO)
+# Logging (structured JSON; see logs.py)
+configure_logging()
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+# Heavy resources, warmed according to STARTUP_WARMUP (see resources.py)
+resources = ResourceManager.from_env()
+resources.register("extraction_pool", extraction_engine.warm_up)
+resources.register("bedrock_client", lambda: bedrock_gateway.client)
+if os.getenv("PRELOAD_RESOURCES", "false").lower() == "true":
+    resources.preload()
+
+# Startup: warm resources and pre-warm the skill gap cache; shutdown: stop the extraction workers
+@asynccontextmanager
+async def lifespan(app):
+    await resources.start()
+    await schedule_skill_gap_prewarm()
+    yield
+    await resources.stop()
+    extraction_engine.shutdown()
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS Middleware
 app.add_middleware(
@@ -44,78 +59,98 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Load NLP model
-nlp = spacy.load("en_core_web_sm")
+# Prometheus metrics: request latency/in-flight per route, stage timings, GET /metrics
+instrument(app)
+register_gateway(bedrock_gateway.model_id, bedrock_gateway)
+register_cache("resume", resume_cache.memory)
+register_cache("skill_gap", skill_gap_cache.memory)
+
+# Liveness (/healthz) and readiness (/readyz) probes
+add_health_routes(app, resources)
+
+# Worker pool for hashing and skill matching so the event loop stays responsive
+worker_pool = ThreadPoolExecutor(max_workers=int(os.getenv("WORKER_POOL_SIZE", str(os.cpu_count() or 4))))
 
 # Utility function for current timestamp
 def now():
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-# Extract text from PDF
-def extract_text_from_pdf(pdf_file):
-    pdf_file.file.seek(0)  # Reset file pointer before reading
-    doc = fitz.open(stream=pdf_file.file.read(), filetype="pdf")
-    return "\n".join(page.get_text() for page in doc)
+# Extract text from PDF (parsed in the extraction process pool)
+async def extract_text_from_pdf(data):
+    return await extraction_engine.extract_pdf(data)
+
+# Extract text from DOCX (parsed in the extraction process pool)
+async def extract_text_from_docx(data):
+    return await extraction_engine.extract_docx(data)
 
-# Extract text from DOCX
-def extract_text_from_docx(docx_file):
-    doc = docx.Document(docx_file.file)
-    return "\n".join([para.text for para in doc.paragraphs])
+# Extract resume text, reusing the cached parse when the same file was uploaded before
+async def load_resume(file):
+    await file.seek(0)
+    return await load_resume_data(file.filename, await file.read())
 
-# Predefined technical skills to improve extraction
+async def load_resume_data(filename, data):
+    if not filename.endswith((".pdf", ".docx")):
+        raise HTTPException(status_code=400, detail="Invalid file type. Only PDF and DOCX are supported.")
+    with stage("hash"):
+        cache_key = await asyncio.get_running_loop().run_in_executor(worker_pool, ResumeCache.key_for_bytes, data)
+    cached = await resume_cache.get(cache_key)
+    if cached and "text" in cached:
+        log_event(logger, "resume cache hit", logging.DEBUG, key=cache_key)
+        return cache_key, cached
+
+    with stage("parse"):
+        if filename.endswith(".pdf"):
+            resume_text = await extract_text_from_pdf(data)
+        else:
+            resume_text = await extract_text_from_docx(data)
+    if not resume_text.strip():
+        return cache_key, {"text": resume_text}
+    return cache_key, await resume_cache.update(cache_key, text=resume_text)
+
+# Predefined technical skills (canonical name -> aliases) to improve extraction
 TECH_SKILLS = {
-    "python", "java", "javascript", "react", "node.js", "django", "flask", 
-    "c++", "c#", "sql", "postgresql", "mongodb", "html", "css", "aws", 
-    "azure", "docker", "kubernetes", "tensorflow", "pandas", "numpy", "git", 
-    "agile", "scrum", "jira", "rest api", "graphql", "machine learning",
-    "express.js", "expressjs", "react.js", "reactjs", "nodejs"
+    "python": [], "java": [], "javascript": [], "react": [], "node.js": ["nodejs"],
+    "django": [], "flask": [], "c++": [], "c#": [], "sql": [], "postgresql": [],
+    "mongodb": [], "html": [], "css": [], "aws": [], "azure": [], "docker": [],
+    "kubernetes": [], "tensorflow": [], "pandas": [], "numpy": [], "git": [],
+    "agile": [], "scrum": [], "jira": [], "rest api": [], "graphql": [],
+    "machine learning": [], "express.js": ["expressjs"], "react.js": ["reactjs"]
 }
 
+# Compiled matcher; SKILL_TAXONOMY_PATH can point to a JSON file of extra skills and aliases
+skill_taxonomy_path = os.getenv("SKILL_TAXONOMY_PATH")
+skill_matcher = (SkillMatcher.from_file(skill_taxonomy_path, base=TECH_SKILLS)
+                 if skill_taxonomy_path else SkillMatcher(TECH_SKILLS))
+
 # Normalize skill names for comparison
 def normalize_skill_name(skill):
-    skill = skill.lower().strip()
-    skill = re.sub(r"[^a-zA-Z0-9.#+]", "", skill)  # Remove special characters
-    
-    # Handle common variations
-    if skill == "nodejs":
-        return "node.js"
-    if skill == "expressjs":
-        return "express.js"
-    if skill == "reactjs":
-        return "react.js"
-    return skill
-
-# Invoke Amazon Bedrock model using provided payload and model parameters
-def invoke_bedrock(prompt_text):
+    skill = compact_skill_name(skill)  # Remove special characters
+    # Map known aliases (e.g. nodejs -> node.js) to their canonical name
+    return skill_matcher.canonical(skill) or skill
+
+# Invoke Amazon Bedrock model through the rate-limited gateway
+async def invoke_bedrock(prompt_text):
     try:
         # Format the prompt if needed (here we simply forward the text)
-        body = {
-            "prompt": prompt_text,
-            "max_gen_len": 2048,  # Change to 2048 if desired
-            "temperature": 0.5,
-            "top_p": 0.9
-        }
-        response = bedrock_client.invoke_model(
-            modelId="meta.llama3-8b-instruct-v1:0",
-            body=json.dumps(body),
-            contentType="application/json",
-            accept="application/json"
+        return await bedrock_gateway.invoke(
+            prompt_text,
+            max_gen_len=2048,  # Change to 2048 if desired
+            temperature=0.5,
+            top_p=0.9
         )
-        response_body = json.loads(response['body'].read())
-        return response_body.get("generation", "")
     except Exception as e:
         logger.error(f"Bedrock Error: {str(e)}")
         logger.error(f"Full Traceback: {traceback.format_exc()}")
         return ""
 
-# Extract skills from the resume text
-def extract_skills_from_resume(text):
+# Match predefined technical skills in the resume text in a single pass
+@timed("skill_match")
+def match_known_skills(text):
+    return skill_matcher.find(text)
+
+# Use Bedrock to extract additional skills; None if the model call failed
+async def extract_skills_with_bedrock(text):
     found_skills = set()
-    for skill in TECH_SKILLS:
-        if re.search(rf"\b{re.escape(skill)}\b", text, re.IGNORECASE):
-            found_skills.add(skill)
-    
-    # Use Bedrock to extract additional skills
     try:
         prompt = f"""
 Extract technical skills from the following resume text. 
@@ -123,26 +158,39 @@ Focus on programming languages, frameworks, databases, tools, and methodologies.
 Resume Text:
 {text}
 """
-        response_text = invoke_bedrock(prompt)
+        response_text = await invoke_bedrock(prompt)
+        if not response_text.strip():
+            return None
         extracted_skills = response_text.strip().split(", ")
         for skill in extracted_skills:
-            normalized_skill = normalize_skill_name(skill)
-            if normalized_skill in TECH_SKILLS:
-                found_skills.add(normalized_skill)
-        logger.info("Additional skills extracted using Bedrock.")
+            canonical_skill = skill_matcher.canonical(skill)
+            if canonical_skill:
+                found_skills.add(canonical_skill)
+        log_event(logger, "bedrock skills extracted", logging.DEBUG, count=len(found_skills))
     except Exception as e:
         logger.error(f"Bedrock Error (Extract Skills): {str(e)}")
         logger.error(f"Full Traceback: {traceback.format_exc()}")
-    
-    logger.info(f"Found Skills: {found_skills}")
-    return list(found_skills)
+        return None
+    return found_skills
+
+# Extract skills from the resume text; the regex scan runs in the worker pool while Bedrock is queried.
+# Also returns whether the Bedrock call succeeded, i.e. whether the skill set is complete.
+async def extract_skills_from_resume(text):
+    loop = asyncio.get_running_loop()
+    known_skills, bedrock_skills = await asyncio.gather(
+        loop.run_in_executor(worker_pool, match_known_skills, text),
+        extract_skills_with_bedrock(text)
+    )
+    found_skills = known_skills | (bedrock_skills or set())
+    log_event(logger, "skills found", logging.DEBUG, skills=found_skills)
+    return list(found_skills), bedrock_skills is not None
 
 # Identify skill gaps
 def identify_skill_gaps(user_skills, job_skills):
     user_skills_normalized = set(map(normalize_skill_name, user_skills))
     job_skills_normalized = set(map(normalize_skill_name, job_skills))
-    logger.info(f"User Skills (Normalized): {user_skills_normalized}")
-    logger.info(f"Job Skills (Normalized): {job_skills_normalized}")
+    log_event(logger, "skills normalized", logging.DEBUG,
+              user_skills=user_skills_normalized, job_skills=job_skills_normalized)
     return list(job_skills_normalized - user_skills_normalized)
 
 # Readiness Score Calculation
@@ -151,20 +199,28 @@ def calculate_readiness_score(user_skills, job_skills):
         return 0  
     user_skills_normalized = set(map(normalize_skill_name, user_skills))
     job_skills_normalized = set(map(normalize_skill_name, job_skills))
+    return readiness_from_normalized(user_skills_normalized, job_skills_normalized)
+
+def readiness_from_normalized(user_skills_normalized, job_skills_normalized):
     match_score = (len(user_skills_normalized & job_skills_normalized) / len(job_skills_normalized)) * 100
     return round(match_score, 2)
 
 # Generate AI-based Course Recommendations using Bedrock
-def generate_course_recommendations(skill_gaps):
+async def generate_course_recommendations(skill_gaps):
     if not skill_gaps:
         return {"message": "No skill gaps detected."}
+    cached = skill_gap_cache.get("recommendations", skill_gaps)
+    if cached is not None:
+        log_event(logger, "skill gap cache hit", logging.DEBUG, kind="recommendations", skill_gaps=skill_gaps)
+        return cached
     
     prompt = f"Suggest 3 high-quality online courses for learning: {', '.join(skill_gaps)}. Provide platform name (Coursera, Udemy, edX) and course title."
     try:
-        time.sleep(1)
-        response_text = invoke_bedrock(prompt)
+        response_text = await invoke_bedrock(prompt)
         courses = response_text.strip().split("\n")
-        logger.info(f"Raw Bedrock Response (Courses): {response_text}")
+        log_payload(logger, "bedrock response", response_text, kind="recommendations")
+        if response_text.strip():
+            skill_gap_cache.put("recommendations", skill_gaps, {"courses": courses})
         return {"courses": courses}
     except Exception as e:
         logger.error(f"Bedrock Error (Course Recommendations): {str(e)}")
@@ -175,9 +231,13 @@ def generate_course_recommendations(skill_gaps):
         }
 
 # Generate AI-based Quiz Questions using Bedrock
-def generate_quizzes(skill_gaps):
+async def generate_quizzes(skill_gaps):
     if not skill_gaps:
         return []
+    cached = skill_gap_cache.get("quizzes", skill_gaps)
+    if cached is not None:
+        log_event(logger, "skill gap cache hit", logging.DEBUG, kind="quizzes", skill_gaps=skill_gaps)
+        return cached
     
     prompt = f"""
 Create 3 multiple-choice quiz questions to test knowledge in: {', '.join(skill_gaps)}.
@@ -201,9 +261,8 @@ Example:
 ]
 """
     try:
-        time.sleep(1)
-        response_text = invoke_bedrock(prompt)
-        logger.info(f"Raw Bedrock Response (Quiz): {response_text}")
+        response_text = await invoke_bedrock(prompt)
+        log_payload(logger, "bedrock response", response_text, kind="quizzes")
         json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
         if json_match:
             json_text = json_match.group(0)
@@ -212,16 +271,70 @@ Example:
             return {"error": "Could not find valid JSON in Bedrock response.", "raw": response_text}
         try:
             quizzes = json.loads(json_text)
-            logger.info(f"Parsed Quizzes: {quizzes}")
+            log_event(logger, "quizzes parsed", logging.DEBUG, count=len(quizzes))
+            if isinstance(quizzes, list):
+                skill_gap_cache.put("quizzes", skill_gaps, quizzes)
             return quizzes
         except json.JSONDecodeError as e:
-            logger.error(f"JSON Decode Error: {str(e)} | Raw Response: {response_text}")
+            logger.error(f"JSON Decode Error: {str(e)}")
+            log_payload(logger, "unparseable bedrock response", response_text, sample_rate=1.0, kind="quizzes")
             return {"error": "Invalid JSON format from Bedrock API.", "raw": response_text}
     except Exception as e:
         logger.error(f"Bedrock Error (Generate Quizzes): {str(e)}")
         logger.error(f"Full Traceback: {traceback.format_exc()}")
         return {"error": "An unexpected error occurred."}
 
+# Pre-generate recommendations and quizzes for common skill-gap combinations
+async def prewarm_skill_gap_cache(gap_sets):
+    for gaps in gap_sets:
+        skill_gaps = sorted({normalize_skill_name(skill) for skill in gaps if skill.strip()})
+        if not skill_gaps:
+            continue
+        await asyncio.gather(generate_course_recommendations(skill_gaps), generate_quizzes(skill_gaps))
+        log_event(logger, "skill gap cache pre-warmed", skill_gaps=skill_gaps)
+
+# Background tasks started by the service; the event loop only holds weak references to
+# tasks, so each is kept here until it completes
+background_tasks = set()
+
+# Gap combinations to pre-warm, e.g. SKILL_GAP_PREWARM="docker,kubernetes;react,node.js"
+async def schedule_skill_gap_prewarm():
+    prewarm = os.getenv("SKILL_GAP_PREWARM", "")
+    gap_sets = [combo.split(",") for combo in prewarm.split(";") if combo.strip()]
+    if gap_sets:
+        task = asyncio.create_task(prewarm_skill_gap_cache(gap_sets))
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+
+# Extract the skills from an uploaded resume, using the resume cache when possible
+async def extract_user_skills(file):
+    # Read file and extract text (skipped entirely on a cache hit)
+    cache_key, cached = await load_resume(file)
+    return await skills_for_resume(cache_key, cached)
+
+async def skills_for_resume(cache_key, cached):
+    resume_text = cached["text"]
+    log_payload(logger, "resume text", resume_text, key=cache_key)
+
+    # Cached skills are reused only if they were extracted with the current taxonomy; a
+    # regex-only result (Bedrock call failed) is returned but not cached
+    user_skills = cached.get("skills") if cached.get("skills_version") == skill_matcher.version else None
+    if user_skills is None:
+        user_skills, complete = await extract_skills_from_resume(resume_text)
+        if user_skills and complete:
+            await resume_cache.update(cache_key, skills=user_skills, skills_version=skill_matcher.version)
+    log_event(logger, "skills extracted", count=len(user_skills or []))
+
+    if not user_skills:
+        raise HTTPException(status_code=400, detail="No skills found in the resume.")
+    return user_skills
+
+# Encode one stage event as an SSE message or an NDJSON line
+def format_stage_event(stage, payload, fmt):
+    if fmt == "sse":
+        return f"event: {stage}\ndata: {json.dumps(payload)}\n\n"
+    return json.dumps({"stage": stage, **payload}) + "\n"
+
 # API: Upload Resume & Analyze Skills
 @app.post("/analyze-skills/")
 async def analyze_skills(
@@ -230,27 +343,17 @@ async def analyze_skills(
     required_skills: str = Form(...)
 ):
     try:
-        # Read file and extract text
-        if file.filename.endswith(".pdf"):
-            resume_text = extract_text_from_pdf(file)
-        elif file.filename.endswith(".docx"):
-            resume_text = extract_text_from_docx(file)
-        else:
-            raise HTTPException(status_code=400, detail="Invalid file type. Only PDF and DOCX are supported.")
-
-        logger.info(f"Extracted Resume Text: {resume_text}")
-        user_skills = extract_skills_from_resume(resume_text)
-        logger.info(f"Extracted Skills: {user_skills}")
-
-        if not user_skills:
-            raise HTTPException(status_code=400, detail="No skills found in the resume.")
+        user_skills = await extract_user_skills(file)
 
         job_skills = [skill.strip() for skill in required_skills.split(",")]
         skill_gaps = identify_skill_gaps(user_skills, job_skills)
-        logger.info(f"Skill Gaps: {skill_gaps}")
+        log_event(logger, "skill gaps identified", logging.DEBUG, skill_gaps=skill_gaps)
         readiness_score = calculate_readiness_score(user_skills, job_skills)
-        recommendations = generate_course_recommendations(skill_gaps)
-        quizzes = generate_quizzes(skill_gaps)
+        # Recommendations and quizzes are independent, so both model calls run in parallel
+        recommendations, quizzes = await asyncio.gather(
+            generate_course_recommendations(skill_gaps),
+            generate_quizzes(skill_gaps)
+        )
 
         return {
             "readiness_score": readiness_score,
@@ -265,6 +368,207 @@ async def analyze_skills(
         logger.error(f"Full Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# API: Upload Resume & Analyze Skills, streaming each stage as soon as it is ready
+@app.post("/analyze-skills/stream")
+async def analyze_skills_stream(
+    file: UploadFile = File(...),
+    job_description: str = Form(...),
+    required_skills: str = Form(...),
+    format: str = Form("ndjson")
+):
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="Invalid format. Use 'ndjson' or 'sse'.")
+    try:
+        user_skills = await extract_user_skills(file)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        logger.error(f"Full Traceback: {traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def stage_events():
+        yield format_stage_event("skills", {"user_skills": user_skills}, format)
+        try:
+            job_skills = [skill.strip() for skill in required_skills.split(",")]
+            skill_gaps = identify_skill_gaps(user_skills, job_skills)
+            yield format_stage_event("readiness", {
+                "readiness_score": calculate_readiness_score(user_skills, job_skills),
+                "job_skills": job_skills,
+                "skill_gaps": skill_gaps
+            }, format)
+
+            # Emit recommendations and quizzes in whichever order the model finishes them
+            async def run_stage(stage, generator):
+                return stage, await generator(skill_gaps)
+            for next_stage in asyncio.as_completed([
+                run_stage("recommendations", generate_course_recommendations),
+                run_stage("quizzes", generate_quizzes)
+            ]):
+                stage, result = await next_stage
+                yield format_stage_event(stage, {stage: result}, format)
+        except Exception as e:
+            logger.error(f"Error: {str(e)}")
+            logger.error(f"Full Traceback: {traceback.format_exc()}")
+            yield format_stage_event("error", {"detail": str(e)}, format)
+        yield format_stage_event("done", {}, format)
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(stage_events(), media_type=media_type)
+
+# Limits for /analyze-skills/batch. Resumes are held in memory until they are analyzed,
+# so besides the per-resume size the whole batch is capped too.
+BATCH_MAX_RESUMES = int(os.getenv("BATCH_MAX_RESUMES", "500"))
+BATCH_MAX_RESUME_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+BATCH_MAX_TOTAL_BYTES = int(os.getenv("BATCH_MAX_TOTAL_BYTES", str(200 * 1024 * 1024)))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+
+def too_many_resumes():
+    return HTTPException(status_code=400, detail=f"Too many resumes (limit {BATCH_MAX_RESUMES}).")
+
+def batch_too_large():
+    return HTTPException(status_code=413, detail=f"Batch exceeds {BATCH_MAX_TOTAL_BYTES} bytes.")
+
+# Contents of an uploaded resume, or None if it is over the size limit; the declared size
+# is checked first and never more than limit + 1 bytes are read
+async def read_upload(file):
+    if file.size is not None and file.size > BATCH_MAX_RESUME_BYTES:
+        return None
+    data = await file.read(BATCH_MAX_RESUME_BYTES + 1)
+    return data if len(data) <= BATCH_MAX_RESUME_BYTES else None
+
+# PDF/DOCX entries of a zip archive (a seekable file, e.g. the spooled upload) as
+# (filename, data); data is None for entries over the size limit. Sizes are checked from
+# the zip directory before anything is decompressed; max_resumes and max_bytes are what
+# is left of the batch limits after the multipart files.
+def read_resume_archive(fileobj, max_resumes, max_bytes):
+    resumes = []
+    with zipfile.ZipFile(fileobj) as archive:
+        for info in archive.infolist():
+            name = info.filename
+            if info.is_dir() or name.startswith("__MACOSX/") or not name.endswith((".pdf", ".docx")):
+                continue
+            if len(resumes) >= max_resumes:
+                raise too_many_resumes()
+            if info.file_size > BATCH_MAX_RESUME_BYTES:
+                resumes.append((name, None))
+                continue
+            max_bytes -= info.file_size
+            if max_bytes < 0:
+                raise batch_too_large()
+            resumes.append((name, archive.read(info)))
+    return resumes
+
+# API: Analyze many resumes (multipart files and/or a zip archive) against one job.
+# Job skills are normalized once, resumes are extracted in parallel, and recommendations
+# and quizzes are generated once per distinct skill-gap set. Events are streamed as
+# resumes finish: gap_set (once per distinct gaps, before the first resume using it),
+# resume, error (per resume) and done.
+@app.post("/analyze-skills/batch")
+async def analyze_skills_batch(
+    files: list[UploadFile] = File(None),
+    archive: UploadFile | None = File(None),
+    job_description: str = Form(...),
+    required_skills: str = Form(...),
+    format: str = Form("ndjson")
+):
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="Invalid format. Use 'ndjson' or 'sse'.")
+    # Uploads are spooled to temporary files by the form parser; the count is checked
+    # before any of them is read, and each is read only up to the per-resume limit
+    files = files or []
+    if len(files) > BATCH_MAX_RESUMES:
+        raise too_many_resumes()
+    resumes = []
+    remaining_bytes = BATCH_MAX_TOTAL_BYTES
+    for file in files:
+        data = await read_upload(file)
+        if data is not None:
+            remaining_bytes -= len(data)
+            if remaining_bytes < 0:
+                raise batch_too_large()
+        resumes.append((file.filename, data))
+    if archive is not None:
+        try:
+            await archive.seek(0)
+            resumes += await asyncio.get_running_loop().run_in_executor(
+                worker_pool, read_resume_archive, archive.file, BATCH_MAX_RESUMES - len(resumes), remaining_bytes
+            )
+        except zipfile.BadZipFile:
+            raise HTTPException(status_code=400, detail="Invalid zip archive.")
+    if not resumes:
+        raise HTTPException(status_code=400, detail="No resumes provided.")
+
+    job_skills = [skill.strip() for skill in required_skills.split(",")]
+    job_skills_normalized = set(map(normalize_skill_name, job_skills))
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    gap_set_tasks = {}
+
+    # Recommendations and quizzes for a gap set, started once and shared by every resume with it
+    def gap_set_task(skill_gaps):
+        key = tuple(skill_gaps)
+        if key not in gap_set_tasks:
+            gap_set_tasks[key] = asyncio.ensure_future(asyncio.gather(
+                generate_course_recommendations(skill_gaps), generate_quizzes(skill_gaps)
+            ))
+        return gap_set_tasks[key]
+
+    async def analyze_one(index, filename, data):
+        try:
+            if data is None:
+                raise HTTPException(status_code=400, detail="Resume exceeds the size limit.")
+            async with semaphore:
+                cache_key, cached = await load_resume_data(filename, data)
+                user_skills = await skills_for_resume(cache_key, cached)
+            user_skills_normalized = set(map(normalize_skill_name, user_skills))
+            skill_gaps = sorted(job_skills_normalized - user_skills_normalized)
+            readiness_score = (readiness_from_normalized(user_skills_normalized, job_skills_normalized)
+                               if job_skills_normalized else 0)
+            await gap_set_task(skill_gaps)
+            return index, filename, {
+                "readiness_score": readiness_score,
+                "user_skills": user_skills,
+                "skill_gaps": skill_gaps,
+            }, None
+        except HTTPException as e:
+            return index, filename, None, e.detail
+        except Exception as e:
+            logger.error(f"Error ({filename}): {str(e)}")
+            return index, filename, None, str(e)
+
+    async def batch_events():
+        emitted_gap_sets = {}
+        failed = 0
+        tasks = [analyze_one(index, filename, data) for index, (filename, data) in enumerate(resumes)]
+        for next_result in asyncio.as_completed(tasks):
+            index, filename, result, error = await next_result
+            if error is not None:
+                failed += 1
+                yield format_stage_event("error", {"index": index, "filename": filename, "detail": error}, format)
+                continue
+            key = tuple(result["skill_gaps"])
+            if key not in emitted_gap_sets:
+                emitted_gap_sets[key] = len(emitted_gap_sets)
+                recommendations, quizzes = gap_set_tasks[key].result()
+                yield format_stage_event("gap_set", {
+                    "gap_set": emitted_gap_sets[key],
+                    "skill_gaps": result["skill_gaps"],
+                    "recommendations": recommendations,
+                    "quizzes": quizzes
+                }, format)
+            yield format_stage_event("resume", {
+                "index": index, "filename": filename, "gap_set": emitted_gap_sets[key], **result
+            }, format)
+        yield format_stage_event("done", {
+            "resumes": len(resumes),
+            "failed": failed,
+            "job_skills": sorted(job_skills_normalized),
+            "distinct_gap_sets": len(emitted_gap_sets)
+        }, format)
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(batch_events(), media_type=media_type)
+
 @app.get("/")
 def read_root():
     return {"message": "API is working!"}
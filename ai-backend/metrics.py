@@ -0,0 +1,153 @@
+import functools
+import inspect
+import os
+import time
+from contextlib import contextmanager, nullcontext
+
+from fastapi import Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from starlette.routing import Match
+
+# Tracing is optional: spans are only recorded when OpenTelemetry is installed and enabled
+try:
+    from opentelemetry import trace  # type: ignore
+except ImportError:
+    trace = None
+
+TRACING_ENABLED = trace is not None and os.getenv("TRACING_ENABLED", "false").lower() == "true"
+_tracer = trace.get_tracer("skillnaav.ai-backend") if TRACING_ENABLED else None
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+STAGE_SECONDS = Histogram(
+    "skillnaav_stage_seconds", "Time spent in each processing stage", ["stage"], buckets=LATENCY_BUCKETS
+)
+STAGE_ERRORS = Counter("skillnaav_stage_errors_total", "Stages that raised an exception", ["stage"])
+REQUEST_SECONDS = Histogram(
+    "skillnaav_request_seconds", "HTTP request latency until the response starts",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS
+)
+REQUESTS_IN_FLIGHT = Gauge("skillnaav_requests_in_flight", "HTTP requests being handled", ["route"])
+BEDROCK_SECONDS = Histogram(
+    "skillnaav_bedrock_call_seconds", "Bedrock call latency including retries and backoff",
+    ["outcome"], buckets=LATENCY_BUCKETS
+)
+
+
+# Time a block as one pipeline stage (download, parse, ner, ...) and, with tracing on, wrap it in a span
+@contextmanager
+def stage(name, **attributes):
+    span = _tracer.start_as_current_span(name, attributes=attributes) if _tracer else nullcontext()
+    start = time.perf_counter()
+    with span:
+        try:
+            yield
+        except Exception:
+            STAGE_ERRORS.labels(name).inc()
+            raise
+        finally:
+            STAGE_SECONDS.labels(name).observe(time.perf_counter() - start)
+
+
+# Decorator form of stage() for plain and async functions
+def timed(name):
+    def decorate(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with stage(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# BedrockGateway on_call hook
+def observe_bedrock_call(latency, retries, ok):
+    BEDROCK_SECONDS.labels("ok" if ok else "failed").observe(latency)
+
+
+# Exposes counters the services already keep (gateway stats, cache hits) at scrape time,
+# so the hot paths do not update Prometheus metrics themselves
+class StatsCollector:
+    def __init__(self):
+        self.gateways = {}
+        self.caches = {}
+
+    def collect(self):
+        calls = CounterMetricFamily("skillnaav_bedrock_calls", "Bedrock calls by outcome", labels=["gateway", "outcome"])
+        retries = CounterMetricFamily("skillnaav_bedrock_retries", "Bedrock retries", labels=["gateway"])
+        throttles = CounterMetricFamily("skillnaav_bedrock_throttles", "Bedrock throttling errors", labels=["gateway"])
+        coalesced = CounterMetricFamily(
+            "skillnaav_bedrock_coalesced", "Requests served by an identical in-flight call", labels=["gateway"]
+        )
+        in_flight = GaugeMetricFamily("skillnaav_bedrock_in_flight", "Bedrock calls in progress", labels=["gateway"])
+        for name, gateway in self.gateways.items():
+            stats = gateway.stats
+            calls.add_metric([name, "ok"], stats.calls - stats.failures)
+            calls.add_metric([name, "failed"], stats.failures)
+            retries.add_metric([name], stats.retries)
+            throttles.add_metric([name], stats.throttles)
+            coalesced.add_metric([name], stats.coalesced)
+            in_flight.add_metric([name], stats.in_flight)
+        yield from (calls, retries, throttles, coalesced, in_flight)
+
+        hits = CounterMetricFamily("skillnaav_cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily("skillnaav_cache_misses", "Cache misses", labels=["cache"])
+        ratio = GaugeMetricFamily("skillnaav_cache_hit_ratio", "Cache hit ratio since start", labels=["cache"])
+        entries = GaugeMetricFamily("skillnaav_cache_entries", "Entries held in memory", labels=["cache"])
+        for name, cache in self.caches.items():
+            hits.add_metric([name], cache.hits)
+            misses.add_metric([name], cache.misses)
+            ratio.add_metric([name], cache.hit_ratio())
+            entries.add_metric([name], len(cache))
+        yield from (hits, misses, ratio, entries)
+
+
+stats_collector = StatsCollector()
+REGISTRY.register(stats_collector)
+
+
+def register_gateway(name, gateway):
+    stats_collector.gateways[name] = gateway
+
+
+# cache is an LRUCache (hits, misses, hit_ratio())
+def register_cache(name, cache):
+    stats_collector.caches[name] = cache
+
+
+def _route_path(app, scope):
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", "unmatched")
+    return "unmatched"
+
+
+# Request latency and in-flight gauges for every route, plus GET /metrics
+def instrument(app):
+    @app.middleware("http")
+    async def track_requests(request: Request, call_next):
+        route = _route_path(app, request.scope)
+        in_flight = REQUESTS_IN_FLIGHT.labels(route)
+        in_flight.inc()
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            in_flight.dec()
+            REQUEST_SECONDS.labels(request.method, route, str(status)).observe(time.perf_counter() - start)
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Only the entity recognizer is needed; en_core_web_sm's ner has its own tok2vec layer,
+# so the shared tok2vec, tagger, parser and lemmatizer are not loaded at all
+NER_EXCLUDE = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+ENTITY_LABELS = {"ORG", "GPE"}
+
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+# Load the trimmed spaCy pipeline on first use
+def get_nlp():
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+
+                model = os.getenv("SPACY_MODEL", "en_core_web_sm")
+                logger.info(f"Loading spaCy model {model} (ner only)...")
+                _nlp = spacy.load(model, exclude=NER_EXCLUDE)
+    return _nlp
+
+
+# ORG/GPE entities for many texts with a single nlp.pipe pass
+def extract_entities_batch(texts, batch_size=64, n_process=1):
+    docs = get_nlp().pipe(texts, batch_size=batch_size, n_process=n_process)
+    return [[ent.text for ent in doc.ents if ent.label_ in ENTITY_LABELS] for doc in docs]
+
+
+# Collects texts from concurrent callers and runs them through nlp.pipe together.
+# A batch is flushed when it reaches batch_size or max_wait seconds after its first text.
+class EntityBatcher:
+    def __init__(self, batch_size=64, max_wait=0.05, n_process=1):
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.n_process = n_process
+        self._pending = []
+        self._flush_handle = None
+        # Running batches; the event loop only keeps weak references to tasks
+        self._running = set()
+        # spaCy pipelines are not thread-safe, so batches run one at a time
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ner")
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            batch_size=int(os.getenv("NER_BATCH_SIZE", "64")),
+            max_wait=float(os.getenv("NER_MAX_WAIT", "0.05")),
+            n_process=int(os.getenv("NER_N_PROCESS", "1")),
+        )
+
+    async def extract(self, text):
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch):
+        texts = [text for text, _ in batch]
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self._executor, extract_entities_batch, texts, self.batch_size, self.n_process
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), entities in zip(batch, results):
+            if not future.done():
+                future.set_result(entities)
+
+
+entity_batcher = EntityBatcher.from_env()
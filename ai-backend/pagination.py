@@ -0,0 +1,61 @@
+import base64
+import json
+
+from bson import json_util
+
+
+# Raised for cursors that were not produced by encode_cursor
+class InvalidCursorError(ValueError):
+    pass
+
+
+# Opaque page token holding the sort-key values of the last document returned
+def encode_cursor(doc, sort):
+    values = {field: doc.get(field) for field, _ in sort}
+    return base64.urlsafe_b64encode(json_util.dumps(values).encode("utf-8")).decode("ascii")
+
+
+# Sort-key values from a page token; it must hold a value for every field of the sort
+def decode_cursor(token, sort):
+    try:
+        values = json_util.loads(base64.urlsafe_b64decode(token.encode("ascii")).decode("utf-8"))
+    except Exception as e:
+        raise InvalidCursorError(f"Invalid cursor: {e}")
+    if not isinstance(values, dict) or any(field not in values for field, _ in sort):
+        raise InvalidCursorError("Invalid cursor: does not match the sort order")
+    return values
+
+
+# Keyset filter selecting documents strictly after `last` in the given sort order,
+# e.g. [(score, -1), (_id, -1)] -> score < s OR (score == s AND _id < id)
+def after_cursor(sort, last):
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {prev: last[prev] for prev, _ in sort[:i]}
+        clause[field] = {"$lt" if direction < 0 else "$gt": last[field]}
+        clauses.append(clause)
+    return {"$or": clauses}
+
+
+# Projection from a comma-separated field list; without one, exclude the given fields
+def projection(fields=None, exclude=()):
+    if fields:
+        return {field.strip(): 1 for field in fields.split(",") if field.strip()}
+    return {field: 0 for field in exclude} or None
+
+
+# One page of a find: documents plus the cursor for the next page (None on the last page)
+async def fetch_page(collection, query, sort, limit, cursor=None, fields=None):
+    if cursor:
+        query = {"$and": [query, after_cursor(sort, decode_cursor(cursor, sort))]}
+    if fields is not None:
+        fields = {**fields, **{field: 1 for field, _ in sort}} if any(fields.values()) else fields
+    docs = await collection.find(query, fields).sort(sort).limit(limit + 1).to_list(limit + 1)
+    next_cursor = encode_cursor(docs[limit - 1], sort) if len(docs) > limit else None
+    return docs[:limit], next_cursor
+
+
+# NDJSON lines produced as the Mongo cursor yields documents
+async def ndjson_lines(cursor, transform=lambda doc: doc):
+    async for doc in cursor:
+        yield json.dumps(transform(doc), default=str) + "\n"
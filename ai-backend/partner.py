@@ -3,26 +3,38 @@ from dotenv import load_dotenv
 load_dotenv()  # Load environment variables from .env file
 
 import asyncio
-from fastapi import FastAPI, Form, HTTPException, status
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Form, HTTPException, Query, status
 from fastapi.middleware.cors import CORSMiddleware
-from pymongo import MongoClient
-import fitz  # PyMuPDF for PDF parsing
-import spacy
+from fastapi.responses import StreamingResponse
+from pymongo import UpdateOne
 import os
 import io
 import json
-import boto3  # type: ignore
-from botocore.exceptions import ClientError # type: ignore
-from urllib.parse import urlparse
-from sklearn.feature_extraction.text import TfidfVectorizer  # type: ignore
-from sklearn.metrics.pairwise import cosine_similarity  # type: ignore
+import hashlib
+import re
 from datetime import datetime
 from bson import ObjectId
-import time
+from cache import ResumeCache, resume_cache
+from candidates import Candidate, TextSpool
+from database import (
+    BULK_WRITE_BATCH_SIZE, LazyCollection, bulk_write_batched, bulk_write_concern, shared_database
+)
+from bedrock_gateway import BedrockGateway
+from extraction import extraction_engine
+from ner import entity_batcher, get_nlp
+from similarity_index import load_sklearn, similarity_store
+from pagination import InvalidCursorError, fetch_page, ndjson_lines, projection
+from s3_resumes import ResumeDownloader, get_s3_client, parse_s3_url
+from shortlist_jobs import InMemoryJobStore, MongoJobStore, ShortlistJobQueue
+from logs import configure_logging, log_event, log_payload
+from metrics import instrument, observe_bedrock_call, register_cache, register_gateway, stage, timed
+from resources import ResourceManager, add_health_routes
 
-# Utility to get current time as string
-def now():
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+# Logging (structured JSON; see logs.py)
+configure_logging()
+logger = logging.getLogger("partner")
 
 # Helper to convert ObjectId to string
 def convert_object_ids(obj):
@@ -33,31 +45,69 @@ def convert_object_ids(obj):
     else:
         return obj
 
-# Load spaCy model
-print(f"[{now()}] Loading spaCy model...")
-nlp = spacy.load('en_core_web_sm')
-
-# AWS Bedrock client setup
-aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID")
-aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY")
-aws_region = os.getenv("AWS_REGION")
-if not all([aws_access_key_id, aws_secret_access_key, aws_region]):
-    raise ValueError("Missing AWS credentials or region in .env!")
-bedrock_client = boto3.client(
-    service_name="bedrock-runtime",
-    region_name=aws_region,
-    aws_access_key_id=aws_access_key_id,
-    aws_secret_access_key=aws_secret_access_key
+# Bedrock gateway; the bedrock-runtime client is created on the first model call
+bedrock_gateway = BedrockGateway.from_env(
+    None, "meta.llama3-8b-instruct-v1:0", on_call=observe_bedrock_call
 )
 
-# MongoDB connection
-db = MongoClient(os.getenv("MONGO_URI")).get_default_database()
-print(f"[{now()}] Connected to MongoDB: {db.name}")
-shortlist_collection = db["shortlisted_candidates"]
-applications_collection = db["applications"]
+# MongoDB collections (async driver, connected on first use); shortlist and score ledger
+# writes are bulk writes
+shortlist_collection = LazyCollection("shortlisted_candidates", write_concern=bulk_write_concern())
+applications_collection = LazyCollection("applications")
+resume_scores_collection = LazyCollection("resume_scores", write_concern=bulk_write_concern())
+
+async def ping_mongo():
+    db = shared_database()
+    await db.command("ping")
+    log_event(logger, "using mongodb database", database=db.name)
+
+# Retrieval order and page size for the shortlist and application endpoints
+SHORTLIST_SORT = [("readiness_score", -1), ("similarity_score", -1), ("_id", -1)]
+APPLICATIONS_SORT = [("_id", 1)]
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = 1000
+
+# Minimum readiness score for a candidate to be shortlisted
+READINESS_CUTOFF = 60
+
+# Full resume text in stored shortlist documents (GET /partner/shortlisted?include_text=true);
+# with SHORTLIST_PERSIST_TEXT=false only scores and metadata are stored
+PERSIST_SHORTLIST_TEXT = os.getenv("SHORTLIST_PERSIST_TEXT", "true").lower() == "true"
+
+# Cheap pre-filter ahead of the LLM readiness check: only the top N resumes whose
+# pre-filter score is at least the minimum are sent to Bedrock (top N of 0 = no limit)
+PREFILTER_TOP_N = int(os.getenv("SHORTLIST_PREFILTER_TOP_N", "50"))
+PREFILTER_MIN_SCORE = float(os.getenv("SHORTLIST_PREFILTER_MIN_SCORE", "0.05"))
+
+# Resumes downloaded, parsed and tagged at once per shortlist run; bounds the raw files
+# and texts held in memory while they wait for the extraction and NER workers
+LOAD_CONCURRENCY = int(os.getenv("SHORTLIST_LOAD_CONCURRENCY", "32"))
+
+# Heavy resources, warmed according to STARTUP_WARMUP (see resources.py). The spaCy model
+# and scikit-learn are read-only and fork-safe, so PRELOAD_RESOURCES loads them pre-fork.
+resources = ResourceManager.from_env()
+resources.register("spacy", get_nlp, fork_safe=True)
+resources.register("sklearn", load_sklearn, fork_safe=True)
+resources.register("extraction_pool", extraction_engine.warm_up)
+resources.register("bedrock_client", lambda: bedrock_gateway.client)
+resources.register("s3_client", get_s3_client)
+resources.register("mongo", ping_mongo)
+if os.getenv("PRELOAD_RESOURCES", "false").lower() == "true":
+    resources.preload()
+
+# Startup: start the shortlist job workers and warm resources, index creation included,
+# without waiting on MongoDB; shutdown: stop the job workers and the extraction workers
+@asynccontextmanager
+async def lifespan(app):
+    await shortlist_jobs.start()
+    await resources.start()
+    yield
+    await resources.stop()
+    await shortlist_jobs.stop()
+    extraction_engine.shutdown()
 
 # FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
@@ -66,151 +116,486 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Bedrock invocation with improved backoff and dynamic truncation
-def invoke_bedrock(prompt_text: str) -> str:
+# Prometheus metrics: request latency/in-flight per route, stage timings, GET /metrics
+instrument(app)
+register_gateway(bedrock_gateway.model_id, bedrock_gateway)
+register_cache("resume", resume_cache.memory)
+register_cache("similarity_index", similarity_store.loaded)
+
+# Liveness (/healthz) and readiness (/readyz) probes
+add_health_routes(app, resources)
+
+async def ensure_indexes():
+    await shortlist_collection.create_index([("internship_id", 1), ("resumeUrl", 1)])
+    await shortlist_collection.create_index([("internship_id", 1)] + SHORTLIST_SORT)
+    await resume_scores_collection.create_index([("internship_id", 1), ("resumeUrl", 1)], unique=True)
+    await applications_collection.create_index("resumeUrl")
+    await applications_collection.create_index([("job_id", 1), ("_id", 1)])
+
+# Bedrock invocation through the rate-limited gateway, with dynamic truncation
+async def invoke_bedrock(prompt_text: str) -> str:
     # dynamically adjust prompt size to avoid token limits
     max_prompt_length = 2000
     safe_prompt = prompt_text[:max_prompt_length]
-    body = {"prompt": safe_prompt, "max_gen_len": 1000, "temperature": 0.5, "top_p": 0.9}
-    retries = 4
-    for attempt in range(1, retries + 1):
-        try:
-            resp = bedrock_client.invoke_model(
-                modelId="meta.llama3-8b-instruct-v1:0",
-                body=json.dumps(body),
-                contentType="application/json",
-                accept="application/json"
-            )
-            out = json.loads(resp['body'].read())
-            return out.get("generation", "")
-        except ClientError as e:
-            code = e.response.get('Error', {}).get('Code', '')
-            print(f"[{now()}] Bedrock ClientError (attempt {attempt}): {code} - {e}")
-            if code == 'ThrottlingException' and attempt < retries:
-                backoff = 2 ** attempt
-                print(f"[{now()}] Throttled. Sleeping for {backoff}s before retrying...")
-                time.sleep(backoff)
-                continue
-            # for other errors or last attempt, break
-            break
-        except Exception as e:
-            print(f"[{now()}] Bedrock Unexpected Error: {e}")
-            break
-
-    print(f"[{now()}] Bedrock invocation failed after {retries} attempts.")
-    return ""
+    return await bedrock_gateway.invoke(safe_prompt, max_gen_len=1000, temperature=0.5, top_p=0.9)
+
+# Pooled, bounded-concurrency resume downloads over a shared S3 client
+resume_downloader = ResumeDownloader.from_env()
+
+# Look up the S3 ETag of a resume so cached parses can be reused without downloading
+@timed("s3_head")
+def get_resume_etag(resume_url: str):
+    try:
+        bucket, key = parse_s3_url(resume_url)
+        return get_s3_client().head_object(Bucket=bucket, Key=key).get("ETag")
+    except Exception as e:
+        log_event(logger, "s3 head error", logging.WARNING, resume_url=resume_url, error=str(e))
+        return None
 
 # Download resume from S3 with logging
-def download_resume_from_s3(resume_url: str):
-    print(f"[{now()}] Downloading resume from: {resume_url}")
+async def download_resume_from_s3(resume_url: str):
+    log_event(logger, "downloading resume", logging.DEBUG, resume_url=resume_url)
     try:
-        parsed = urlparse(resume_url)
-        bucket = parsed.netloc.split('.')[0]
-        key = parsed.path.lstrip('/')
-        s3 = boto3.client(
-            's3',
-            aws_access_key_id=os.getenv("Resume_AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.getenv("Resume_AWS_SECRET_ACCESS_KEY"),
-            region_name=os.getenv("Resume_AWS_REGION")
-        )
-        buf = io.BytesIO()
-        s3.download_fileobj(bucket, key, buf)
-        buf.seek(0)
-        return buf
+        with stage("download"):
+            return io.BytesIO(await resume_downloader.download_async(resume_url))
     except Exception as e:
-        print(f"[{now()}] S3 Download Error for {resume_url}: {e}")
+        log_event(logger, "s3 download error", logging.ERROR, resume_url=resume_url, error=str(e))
         return None
 
-# Extract text from PDF
-def extract_text_from_pdf(pdf_file):
+# Extract text from PDF in the extraction process pool
+async def extract_text_from_pdf(pdf_file):
     text = ""
     try:
-        pdf_file.seek(0)
-        with fitz.open(stream=pdf_file.read(), filetype="pdf") as doc:
-            for page in doc:
-                text += page.get_text("text")
+        with stage("parse"):
+            text = await extraction_engine.extract_pdf(pdf_file.getvalue())
     except Exception as e:
-        print(f"[{now()}] PDF Extract Error: {e}")
+        log_event(logger, "pdf extract error", logging.ERROR, error=str(e))
     return text
 
-# Extract resume info using spaCy
-def extract_resume_info(text):
+# Extract resume info using spaCy; concurrent resumes are batched through nlp.pipe
+async def extract_resume_info(text):
     skills = []
     try:
-        doc = nlp(text)
-        skills = [ent.text for ent in doc.ents if ent.label_ in ["ORG", "GPE"]]
+        with stage("ner"):
+            skills = await entity_batcher.extract(text)
     except Exception as e:
-        print(f"[{now()}] NLP Extract Error: {e}")
+        log_event(logger, "nlp extract error", logging.ERROR, error=str(e))
     return {"text": text, "skills": skills}
 
 # Get readiness score with prompt truncation
-def get_readiness_score(resume_text: str, job_description: str, job_skills: list) -> int:
+async def get_readiness_score(resume_text: str, job_description: str, job_skills: list) -> int:
     try:
         prompt = (
             f"Evaluate this resume out of 100.\nResume snippet:\n{resume_text[:500]}\n"
             f"Job Description snippet:\n{job_description[:500]}\nSkills:{job_skills}"
         )
-        score_txt = invoke_bedrock(prompt)
-        import re
+        score_txt = await invoke_bedrock(prompt)
+        log_payload(logger, "bedrock response", score_txt, kind="readiness")
         m = re.search(r"\d+", score_txt)
         return int(m.group()) if m else 0
     except Exception as e:
-        print(f"[{now()}] Score Error: {e}")
+        log_event(logger, "score error", logging.ERROR, error=str(e))
         return 0
 
-# TF-IDF similarity
-def calculate_similarity(resume_texts, job_description, job_skills):
-    if not resume_texts:
+# TF-IDF similarity of candidates against the internship's persistent index. Only resumes
+# that are new to the index or whose text changed (by TextRef digest) are streamed from
+# the spool and added, so no vectorizer is refit and scores are comparable across runs.
+@timed("tfidf")
+def calculate_similarity(internship_id, candidates, spool, job_description, job_skills):
+    if not candidates:
         return []
+    resume_urls = [c.resume_url for c in candidates]
+    stale = [candidates[i] for i in similarity_store.stale(
+        internship_id, resume_urls, [c.text_ref.digest for c in candidates]
+    )]
+    if stale:
+        similarity_store.add(
+            internship_id, [c.resume_url for c in stale], spool.iter_texts([c.text_ref for c in stale]),
+            [c.text_ref.digest for c in stale]
+        )
     job_details = job_description + " " + " ".join(job_skills)
-    docs = [job_details] + resume_texts
-    vec = TfidfVectorizer()
-    tfidf_matrix = vec.fit_transform(docs)
-    sims = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:]).flatten()
-    return sims.tolist()
-
-# Process a single resume
-async def process_resume(resume_url, job_description, job_skills_list):
-    application = await asyncio.get_event_loop().run_in_executor(
-        None, lambda: applications_collection.find_one({"resumeUrl": resume_url})
-    )
-    if application:
-        name = application.get("userName") or application.get("name") or "N/A"
-        email = application.get("userEmail") or application.get("email") or "N/A"
-        applied_date = (application.get("appliedDate") or application.get("applied_date")
-                        or application.get("appliedOn") or "N/A")
-        student_id = (application.get("studentId") or application.get("student_id")
-                      or application.get("studentID") or "N/A")
-    else:
-        name = email = applied_date = student_id = "N/A"
+    sims = similarity_store.scores(internship_id, job_details, resume_urls)
+    return [sims.get(url, 0) for url in resume_urls]
+
+# Download, parse and run NER on a resume, reusing cached results keyed by S3 ETag
+async def load_resume_info(resume_url, etag=None):
+    loop = asyncio.get_event_loop()
+    if etag is None:
+        etag = await loop.run_in_executor(None, get_resume_etag, resume_url)
+    cache_key = ResumeCache.key_for_etag(etag) if etag else None
+    cached = await resume_cache.get(cache_key) if cache_key else None
+    if cached and "text" in cached and "entities" in cached:
+        log_event(logger, "resume cache hit", logging.DEBUG, resume_url=resume_url)
+        return {"text": cached["text"], "skills": cached["entities"]}
 
-    file_stream = await asyncio.get_event_loop().run_in_executor(None, download_resume_from_s3, resume_url)
+    file_stream = await download_resume_from_s3(resume_url)
     if not file_stream:
         return None
-    text = await asyncio.get_event_loop().run_in_executor(None, extract_text_from_pdf, file_stream)
-    info = await asyncio.get_event_loop().run_in_executor(None, extract_resume_info, text)
-    readiness = await asyncio.get_event_loop().run_in_executor(None, get_readiness_score, text, job_description, job_skills_list)
-
-    if readiness > 60:
-        return {
-            "student_id": student_id,
-            "name": name,
-            "email": email,
-            "appliedDate": applied_date,
-            "resumeUrl": resume_url,
-            "readiness_score": readiness,
-            "text": info["text"],
-            "skills": info["skills"]
-        }
+    if cache_key is None:
+        cache_key = ResumeCache.key_for_bytes(file_stream.getvalue())
+    text = await extract_text_from_pdf(file_stream)
+    info = await extract_resume_info(text)
+    if text.strip():
+        await resume_cache.update(cache_key, text=text, entities=info["skills"])
+    return info
+
+# Applicant fields used in the shortlist and the names they appear under in applications
+APPLICANT_FIELDS = {
+    "student_id": ["studentId", "student_id", "studentID"],
+    "name": ["userName", "name"],
+    "email": ["userEmail", "email"],
+    "appliedDate": ["appliedDate", "applied_date", "appliedOn"],
+}
+APPLICATION_PROJECTION = {
+    "_id": 0, "resumeUrl": 1, **{name: 1 for names in APPLICANT_FIELDS.values() for name in names}
+}
+
+# Map an application (or None) to the shortlist's applicant fields
+def normalize_applicant(application):
+    application = application or {}
+    return {
+        field: next((application[name] for name in names if application.get(name)), "N/A")
+        for field, names in APPLICANT_FIELDS.items()
+    }
+
+# Applicant details for many resumes with a single $in query on the indexed resumeUrl
+async def lookup_applicants(resume_urls):
+    with stage("mongo_applicants"):
+        applications = await applications_collection.find(
+            {"resumeUrl": {"$in": list(resume_urls)}}, APPLICATION_PROJECTION
+        ).to_list(None)
+    by_url = {}
+    for application in applications:
+        by_url.setdefault(application["resumeUrl"], application)
+    return {url: normalize_applicant(by_url.get(url)) for url in resume_urls}
+
+# Load a resume into a compact candidate record; its text goes to the run's spool
+async def load_candidate(resume_url, spool, etag=None):
+    info = await load_resume_info(resume_url, etag)
+    if info is None:
+        return None
+    return Candidate(resume_url, spool.put(info["text"]), info["skills"])
+
+# LLM readiness score for a loaded candidate; only the prompt snippet is read back
+async def score_candidate(candidate, spool, job_description, job_skills_list, applicant=None):
+    if applicant is None:
+        applicant = (await lookup_applicants([candidate.resume_url]))[candidate.resume_url]
+    candidate.applicant = applicant
+    candidate.readiness_score = await get_readiness_score(
+        spool.get(candidate.text_ref, max_chars=500), job_description, job_skills_list
+    )
+    return candidate
+
+# Score a single resume; returns None only if it could not be downloaded
+async def score_resume(resume_url, spool, job_description, job_skills_list, etag=None, applicant=None):
+    candidate = await load_candidate(resume_url, spool, etag)
+    if candidate is None:
+        return None
+    return await score_candidate(candidate, spool, job_description, job_skills_list, applicant)
+
+# Fraction of the job skills mentioned in the resume text
+def keyword_overlap(text, job_skills_list):
+    if not job_skills_list:
+        return 0.0
+    lowered = text.lower()
+    hits = sum(
+        1 for skill in job_skills_list
+        if re.search(rf"(?<!\w){re.escape(str(skill).lower().strip())}(?!\w)", lowered)
+    )
+    return hits / len(job_skills_list)
+
+# First ranking tier: TF-IDF similarity and keyword overlap for every loaded candidate,
+# with the text streamed from the spool into the similarity index; no model calls
+def prefilter_scores(internship_id, loaded, spool, job_description, job_skills_list):
+    if not loaded:
+        return
+    sims = calculate_similarity(internship_id, loaded, spool, job_description, job_skills_list)
+    overlaps = [keyword_overlap(text, job_skills_list) for text in spool.iter_texts([c.text_ref for c in loaded])]
+    for candidate, sim, overlap in zip(loaded, sims, overlaps):
+        candidate.similarity_score = sim
+        candidate.prefilter_score = (sim + overlap) / 2
+
+# URLs sent on to the LLM: the top N by pre-filter score among those above the minimum
+def select_for_scoring(scores, top_n, min_score):
+    ranked = sorted((url for url, score in scores.items() if score >= min_score), key=scores.get, reverse=True)
+    return ranked[:top_n] if top_n else ranked
+
+def prefilter_resumes(internship_id, loaded, spool, job_description, job_skills_list, top_n, min_score):
+    prefilter_scores(internship_id, loaded, spool, job_description, job_skills_list)
+    by_url = {c.resume_url: c for c in loaded}
+    selected = select_for_scoring({c.resume_url: c.prefilter_score for c in loaded}, top_n, min_score)
+    return [by_url[url] for url in selected]
+
+# Download, parse and tag resumes, LOAD_CONCURRENCY at a time; failed downloads are left out
+async def load_candidates(resumes, spool, etags=None):
+    etags = etags or [None] * len(resumes)
+    semaphore = asyncio.Semaphore(LOAD_CONCURRENCY)
+
+    async def load(url, etag):
+        async with semaphore:
+            return await load_candidate(url, spool, etag)
+
+    loaded = await asyncio.gather(*[load(url, etag) for url, etag in zip(resumes, etags)])
+    return [c for c in loaded if c]
+
+# Tiered ranking: load every resume, pre-filter them all cheaply, then send only the
+# selected ones to the LLM. Returns the LLM-scored candidates, the URLs of every resume
+# that was loaded, and a report of how many model calls the pre-filter saved.
+async def rank_resumes(internship_id, job_description, job_skills_list, resumes, spool, etags=None,
+                       top_n=PREFILTER_TOP_N, min_score=PREFILTER_MIN_SCORE):
+    loaded = await load_candidates(resumes, spool, etags)
+
+    selected = await asyncio.to_thread(
+        prefilter_resumes, internship_id, loaded, spool, job_description, job_skills_list, top_n, min_score
+    )
+    applicants = await lookup_applicants([c.resume_url for c in selected])
+    scored = await asyncio.gather(*[
+        score_candidate(c, spool, job_description, job_skills_list, applicants[c.resume_url])
+        for c in selected
+    ])
+
+    report = {
+        "resumes": len(resumes),
+        "loaded": len(loaded),
+        "llm_calls": len(selected),
+        "llm_calls_saved": len(loaded) - len(selected),
+    }
+    log_event(logger, "pre-filter", spooled_bytes=spool.size, **report)
+    return scored, [c.resume_url for c in loaded], report
+
+# Process a single resume, keeping it only if it passes the readiness cutoff
+async def process_resume(resume_url, spool, job_description, job_skills_list, applicant=None):
+    candidate = await score_resume(resume_url, spool, job_description, job_skills_list, applicant=applicant)
+    if candidate and candidate.readiness_score > READINESS_CUTOFF:
+        return candidate
     return None
 
+# Hash of the job inputs a readiness score depends on; a change forces re-scoring
+def job_description_hash(job_description, job_skills_list):
+    payload = json.dumps([job_description, sorted(map(str, job_skills_list))])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+# Download and pre-filter only resumes that are new for this internship or whose file
+# (S3 ETag) or job description changed since their last run; the rest keep the
+# pre-filter and readiness scores stored in the ledger. The top N is then picked from
+# the whole posting, and only selected resumes without a readiness score for the current
+# job description go to the LLM, so repeating a run with nothing changed makes no calls.
+# The resulting shortlist is the one a full run would produce.
+async def shortlist_incremental(internship_id, job_description, job_skills_list, resumes, spool,
+                                top_n=PREFILTER_TOP_N, min_score=PREFILTER_MIN_SCORE):
+    internship_obj_id = ObjectId(internship_id)
+    jd_hash = job_description_hash(job_description, job_skills_list)
+    loop = asyncio.get_event_loop()
+    resumes = list(dict.fromkeys(resumes))
+
+    with stage("mongo_ledger_read"):
+        previous = {
+            doc["resumeUrl"]: doc async for doc in resume_scores_collection.find(
+                {"internship_id": internship_obj_id, "resumeUrl": {"$in": resumes}},
+                {"resumeUrl": 1, "etag": 1, "jd_hash": 1, "prefilter_score": 1, "similarity_score": 1,
+                 "readiness_score": 1, "shortlisted": 1}
+            )
+        }
+    etags = await asyncio.gather(*[loop.run_in_executor(None, get_resume_etag, url) for url in resumes])
+    etag_by_url = dict(zip(resumes, etags))
+    unchanged = {
+        url: previous[url] for url, etag in etag_by_url.items()
+        if etag and url in previous
+        and previous[url].get("etag") == etag and previous[url].get("jd_hash") == jd_hash
+        and previous[url].get("prefilter_score") is not None
+    }
+    changed = [url for url in resumes if url not in unchanged]
+    changed_urls = set(changed)
+    log_event(logger, "incremental shortlist", changed=len(changed), resumes=len(resumes))
+
+    loaded = await load_candidates(changed, spool, [etag_by_url[url] for url in changed])
+    await asyncio.to_thread(prefilter_scores, internship_id, loaded, spool, job_description, job_skills_list)
+    by_url = {c.resume_url: c for c in loaded}
+
+    # Rank the whole posting: stored scores for unchanged resumes, fresh ones for the rest
+    prefilter = {
+        url: unchanged[url]["prefilter_score"] if url in unchanged else by_url[url].prefilter_score
+        for url in resumes if url in unchanged or url in by_url
+    }
+    selected = select_for_scoring(prefilter, top_n, min_score)
+    stored = {url: entry["readiness_score"] for url, entry in unchanged.items()
+              if entry.get("readiness_score") is not None}
+
+    # Selected resumes that are scored now, or whose stored passing score is not on the
+    # shortlist yet, need their text; unchanged ones are reloaded (normally from the resume cache)
+    to_score = [url for url in selected if url not in stored]
+    restored = [url for url in selected if url in stored
+                and stored[url] > READINESS_CUTOFF and not unchanged[url].get("shortlisted")]
+    reload = [url for url in to_score + restored if url not in by_url]
+    for candidate in await load_candidates(reload, spool, [etag_by_url[url] for url in reload]):
+        entry = unchanged[candidate.resume_url]
+        candidate.prefilter_score = entry["prefilter_score"]
+        candidate.similarity_score = entry.get("similarity_score")
+        by_url[candidate.resume_url] = candidate
+
+    scoring = [by_url[url] for url in to_score if url in by_url]
+    restoring = [by_url[url] for url in restored if url in by_url]
+    applicants = await lookup_applicants([c.resume_url for c in scoring + restoring])
+    scored = await asyncio.gather(*[
+        score_candidate(c, spool, job_description, job_skills_list, applicants[c.resume_url])
+        for c in scoring
+    ])
+    for candidate in restoring:
+        candidate.applicant = applicants[candidate.resume_url]
+        candidate.readiness_score = stored[candidate.resume_url]
+
+    report = {
+        "resumes": len(resumes),
+        "loaded": len(by_url),
+        "llm_calls": len(scoring),
+        "llm_calls_saved": len(prefilter) - len(scoring),
+    }
+    log_event(logger, "pre-filter", spooled_bytes=spool.size, **report)
+
+    # Ledger: every loaded resume with its pre-filter scores, readiness scores from this
+    # run, and the shortlisted flag of every resume whose status changed. Resumes whose
+    # text could not be extracted are not recorded.
+    readiness = {**stored, **{c.resume_url: c.readiness_score for c in scored}}
+    passing = {
+        url for url in selected if readiness.get(url) is not None and readiness[url] > READINESS_CUTOFF
+        and (url not in restored or url in by_url)
+    }
+    now = datetime.utcnow()
+    ledger = []
+    for url in prefilter:
+        fields = {"shortlisted": url in passing}
+        if url in changed_urls:
+            candidate = by_url[url]
+            if not candidate.text_ref.length:
+                continue  # extraction failed; retried next run rather than recorded as scored
+            fields.update(etag=etag_by_url[url], jd_hash=jd_hash, prefilter_score=candidate.prefilter_score,
+                          similarity_score=candidate.similarity_score, readiness_score=readiness.get(url),
+                          scored_at=now)
+        elif url in to_score and url in readiness:
+            fields.update(readiness_score=readiness[url], scored_at=now)
+        elif unchanged[url].get("shortlisted") == fields["shortlisted"]:
+            continue
+        ledger.append(UpdateOne({"internship_id": internship_obj_id, "resumeUrl": url}, {"$set": fields}, upsert=True))
+    with stage("mongo_ledger_write"):
+        await bulk_write_batched(resume_scores_collection, ledger)
+
+    # Re-ranked resumes that no longer pass leave the shortlist
+    dropped = [url for url in prefilter if url not in passing
+               and (url not in unchanged or unchanged[url].get("shortlisted"))]
+    if dropped:
+        with stage("mongo_shortlist_write"):
+            await shortlist_collection.delete_many(
+                {"internship_id": internship_obj_id, "resumeUrl": {"$in": dropped}}
+            )
+
+    candidates = [c for c in list(scored) + restoring if c.resume_url in passing]
+    candidates = await finalize_shortlist(internship_id, job_description, job_skills_list, candidates, spool)
+    return candidates, len(resumes) - len(changed), report
+
+# Upserts for a batch of shortlisted candidates. The full text is read back from the
+# spool only when it is persisted; otherwise any copy stored by an earlier run is removed.
+async def shortlist_upserts(internship_obj_id, candidates, spool):
+    if PERSIST_SHORTLIST_TEXT:
+        texts = await asyncio.to_thread(list, spool.iter_texts([c.text_ref for c in candidates]))
+        return [
+            UpdateOne({"internship_id": internship_obj_id, "resumeUrl": c.resume_url},
+                      {"$set": c.to_document(internship_obj_id, text)}, upsert=True)
+            for c, text in zip(candidates, texts)
+        ]
+    return [
+        UpdateOne({"internship_id": internship_obj_id, "resumeUrl": c.resume_url},
+                  {"$set": c.to_document(internship_obj_id), "$unset": {"text": ""}}, upsert=True)
+        for c in candidates
+    ]
+
+# Add similarity scores, rank candidates and store the shortlist
+async def finalize_shortlist(internship_id, job_description, job_skills_list, candidates, spool):
+    # Candidates that went through the pre-filter already carry their similarity score
+    missing = [c for c in candidates if c.similarity_score is None]
+    if missing:
+        sims = await asyncio.to_thread(
+            calculate_similarity, internship_id, missing, spool, job_description, job_skills_list
+        )
+        for i, cand in enumerate(missing):
+            cand.similarity_score = sims[i] if i < len(sims) else 0
+
+    candidates = sorted(candidates, key=lambda c: (c.readiness_score, c.similarity_score or 0), reverse=True)
+    if candidates:
+        # Upsert on (internship_id, resumeUrl) so re-runs replace earlier results instead of duplicating them
+        internship_obj_id = ObjectId(internship_id)
+        with stage("mongo_shortlist_write"):
+            for start in range(0, len(candidates), BULK_WRITE_BATCH_SIZE):
+                batch = candidates[start:start + BULK_WRITE_BATCH_SIZE]
+                await bulk_write_batched(shortlist_collection, await shortlist_upserts(internship_obj_id, batch, spool))
+            ids = {
+                doc["resumeUrl"]: doc["_id"] async for doc in shortlist_collection.find(
+                    {"internship_id": internship_obj_id, "resumeUrl": {"$in": [c.resume_url for c in candidates]}},
+                    {"resumeUrl": 1}
+                )
+            }
+        for cand in candidates:
+            cand.shortlist_id = ids.get(cand.resume_url)
+    return candidates
+
+# Response documents for shortlisted candidates; the text is read back only on request
+async def shortlist_documents(internship_id, candidates, spool, include_text=False):
+    texts = [None] * len(candidates)
+    if include_text:
+        texts = await asyncio.to_thread(list, spool.iter_texts([c.text_ref for c in candidates]))
+    internship_obj_id = ObjectId(internship_id)
+    return convert_object_ids([c.to_document(internship_obj_id, text) for c, text in zip(candidates, texts)])
+
+# Background shortlist jobs: applicant details for all of a job's pending resumes, looked
+# up once with a single $in query before its items are scored
+async def prefetch_shortlist_job(params, resume_urls):
+    return await lookup_applicants(resume_urls)
+
+# Background shortlist jobs: score one resume; resume text is not kept in the job document
+async def process_shortlist_item(params, resume_url, applicants):
+    with TextSpool.from_env() as spool:
+        candidate = await process_resume(
+            resume_url, spool, params["job_description"], params["job_skills"], applicants.get(resume_url)
+        )
+    return candidate.to_document() if candidate else None
+
+# Background shortlist jobs: reload text (normally from the resume cache) and finalize
+async def finalize_shortlist_job(params, results):
+    with TextSpool.from_env() as spool:
+        loaded = await asyncio.gather(*[load_candidate(result["resumeUrl"], spool) for result in results])
+        candidates = []
+        for result, candidate in zip(results, loaded):
+            if candidate:
+                candidate.applicant = {field: result.get(field, "N/A") for field in APPLICANT_FIELDS}
+                candidate.readiness_score = result["readiness_score"]
+                candidates.append(candidate)
+        candidates = await finalize_shortlist(
+            params["internship_id"], params["job_description"], params["job_skills"], candidates, spool
+        )
+        return await shortlist_documents(params["internship_id"], candidates, spool)
+
+# SHORTLIST_JOB_STORE=memory keeps jobs in-process (tests, local runs without Mongo)
+job_store = (InMemoryJobStore() if os.getenv("SHORTLIST_JOB_STORE") == "memory"
+             else MongoJobStore(LazyCollection("shortlist_jobs")))
+shortlist_jobs = ShortlistJobQueue.from_env(
+    job_store, process_shortlist_item, finalize_shortlist_job, prefetch_shortlist_job
+)
+
+# Index creation has no first-use trigger, so it runs in the background in every
+# STARTUP_WARMUP mode and is retried until MongoDB is reachable
+resources.register("mongo_indexes", ensure_indexes, always=True)
+resources.register("shortlist_job_indexes", job_store.ensure_indexes, always=True)
+
 # Remaining endpoints
 @app.post("/partner/shortlist")
 async def shortlist_candidates(
     internship_id: str = Form(...),
     job_description: str = Form(...),
     job_skills: str = Form(...),
-    resumes: list[str] = Form(...)
+    resumes: list[str] = Form(...),
+    incremental: bool = Form(False),
+    prefilter_top_n: int | None = Form(None),
+    prefilter_min_score: float | None = Form(None),
+    include_text: bool = Form(False)
 ):
     try:
         internship_obj_id = ObjectId(internship_id)
@@ -222,24 +607,100 @@ async def shortlist_candidates(
     except Exception:
         job_skills_list = []
 
-    tasks = [process_resume(url, job_description, job_skills_list) for url in resumes]
-    results = await asyncio.gather(*tasks)
-    candidates = [c for c in results if c]
+    top_n = PREFILTER_TOP_N if prefilter_top_n is None else prefilter_top_n
+    min_score = PREFILTER_MIN_SCORE if prefilter_min_score is None else prefilter_min_score
 
-    if candidates:
-        sims = calculate_similarity([c['text'] for c in candidates], job_description, job_skills_list)
-        for i, cand in enumerate(candidates):
-            cand['similarity_score'] = sims[i] if i < len(sims) else 0
-            cand['internship_id'] = ObjectId(internship_id)
+    # Resume text is spooled for the duration of the request; candidates only carry references
+    with TextSpool.from_env() as spool:
+        if incremental:
+            candidates, skipped, report = await shortlist_incremental(
+                internship_id, job_description, job_skills_list, resumes, spool, top_n, min_score
+            )
+            documents = await shortlist_documents(internship_id, candidates, spool, include_text)
+            return {"shortlisted_candidates": documents, "skipped": skipped, "prefilter": report}
 
-    candidates = sorted(candidates, key=lambda x: (x['readiness_score'], x.get('similarity_score', 0)), reverse=True)
-    if candidates:
-        shortlist_collection.insert_many(candidates)
+        scored, _, report = await rank_resumes(
+            internship_id, job_description, job_skills_list, resumes, spool, top_n=top_n, min_score=min_score
+        )
+        candidates = [c for c in scored if c.readiness_score > READINESS_CUTOFF]
+        candidates = await finalize_shortlist(internship_id, job_description, job_skills_list, candidates, spool)
+        documents = await shortlist_documents(internship_id, candidates, spool, include_text)
+
+    return {"shortlisted_candidates": documents, "prefilter": report}
+
+# Queue shortlisting as a background job and return its id immediately
+@app.post("/partner/shortlist/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_shortlist_job(
+    internship_id: str = Form(...),
+    job_description: str = Form(...),
+    job_skills: str = Form(...),
+    resumes: list[str] = Form(...)
+):
+    try:
+        ObjectId(internship_id)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid internship_id: {e}")
+
+    try:
+        job_skills_list = json.loads(job_skills)
+    except Exception:
+        job_skills_list = []
+
+    params = {"internship_id": internship_id, "job_description": job_description, "job_skills": job_skills_list}
+    job_id = await shortlist_jobs.submit(params, resumes)
+    log_event(logger, "shortlist job queued", job_id=job_id, resumes=len(resumes))
+    return {"job_id": job_id, "status": "queued"}
 
-    return {"shortlisted_candidates": convert_object_ids(candidates)}
+# Per-resume progress and partial results of a shortlist job
+@app.get("/partner/shortlist/jobs/{job_id}")
+async def get_shortlist_job(job_id: str):
+    job = await job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Shortlist job '{job_id}' not found")
 
+    partial = sorted(
+        (item["result"] for item in job["items"] if item["result"]),
+        key=lambda x: x['readiness_score'], reverse=True
+    )
+    return convert_object_ids({
+        "job_id": job["_id"],
+        "status": job["status"],
+        "total": job["total"],
+        "processed": job["processed"],
+        "error": job["error"],
+        "progress": [{"resumeUrl": item["resumeUrl"], "status": item["status"]} for item in job["items"]],
+        "partial_results": partial,
+        "shortlisted_candidates": job["shortlisted_candidates"],
+    })
+
+# Top-k indexed resumes for a job description, answered from the similarity index
+@app.post("/partner/similarity/{internship_id}")
+async def query_similarity(
+    internship_id: str,
+    job_description: str = Form(...),
+    job_skills: str = Form("[]"),
+    k: int = Form(10)
+):
+    try:
+        job_skills_list = json.loads(job_skills)
+    except Exception:
+        job_skills_list = []
+    job_details = job_description + " " + " ".join(job_skills_list)
+    with stage("tfidf_query"):
+        top = await asyncio.to_thread(similarity_store.top_k, internship_id, job_details, k)
+    return {"results": [{"resumeUrl": url, "similarity_score": score} for url, score in top]}
+
+# Shortlisted candidates sorted by score, one page at a time (or streamed as NDJSON).
+# The resume text is left out unless include_text is set or it is listed in fields.
 @app.get("/partner/shortlisted/{internship_id}")
-async def get_shortlisted_candidates(internship_id: str):
+async def get_shortlisted_candidates(
+    internship_id: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+    include_text: bool = False,
+    stream: bool = False
+):
     try:
         internship_obj_id = ObjectId(internship_id)
     except Exception as e:
@@ -247,18 +708,47 @@ async def get_shortlisted_candidates(internship_id: str):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid internship_id '{internship_id}': {e}"
         )
+    query = {"internship_id": internship_obj_id}
+    fields_projection = projection(fields, exclude=() if include_text else ("text",))
+    if stream:
+        docs = shortlist_collection.find(query, fields_projection).sort(SHORTLIST_SORT)
+        return StreamingResponse(ndjson_lines(docs, convert_object_ids), media_type="application/x-ndjson")
     try:
-        docs = list(shortlist_collection.find({"internship_id": internship_obj_id}))
-        return {"shortlisted_candidates": convert_object_ids(docs)}
+        with stage("mongo_fetch_page"):
+            docs, next_cursor = await fetch_page(
+                shortlist_collection, query, SHORTLIST_SORT, limit, cursor, fields_projection
+            )
+        return {"shortlisted_candidates": convert_object_ids(docs), "next_cursor": next_cursor}
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
-        print(f"[{now()}] Error retrieving shortlisted: {e}")
+        log_event(logger, "error retrieving shortlisted", logging.ERROR, error=str(e))
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
+# Applications for a job, one page at a time (or streamed as NDJSON)
 @app.get("/partner/fetch-applications/{job_id}")
-async def fetch_applications(job_id: str):
+async def fetch_applications(
+    job_id: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    fields: str | None = None,
+    stream: bool = False
+):
+    query = {"job_id": job_id}
+    fields_projection = projection(fields)
+    # _id is only needed for paging and is not part of the response
+    without_id = lambda doc: convert_object_ids({k: v for k, v in doc.items() if k != "_id"})
+    if stream:
+        docs = applications_collection.find(query, fields_projection).sort(APPLICATIONS_SORT)
+        return StreamingResponse(ndjson_lines(docs, without_id), media_type="application/x-ndjson")
     try:
-        apps = list(db["applications"].find({"job_id": job_id}, {"_id": 0}))
-        return {"applications": convert_object_ids(apps)}
+        with stage("mongo_fetch_page"):
+            apps, next_cursor = await fetch_page(
+                applications_collection, query, APPLICATIONS_SORT, limit, cursor, fields_projection
+            )
+        return {"applications": [without_id(app) for app in apps], "next_cursor": next_cursor}
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
-        print(f"[{now()}] Error fetching applications: {e}")
+        log_event(logger, "error fetching applications", logging.ERROR, error=str(e))
         return {"error": str(e)}
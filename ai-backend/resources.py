@@ -0,0 +1,133 @@
+import asyncio
+import gc
+import inspect
+import logging
+import os
+import time
+
+from fastapi import Response, status
+
+from logs import log_event
+
+logger = logging.getLogger(__name__)
+
+
+# Heavy resources (models, client pools, worker processes) are created on first use by
+# their own modules. The manager only decides when to warm them: in the background after
+# startup (default), before serving (STARTUP_WARMUP=blocking) or not at all (lazy), and
+# tracks what is loaded for /readyz. Resources registered with always=True (startup work
+# with no first-use trigger, e.g. index creation) are warmed in the background even in
+# lazy mode. Failed resources are retried with exponential backoff up to
+# RESOURCE_RETRY_MAX_SECONDS, so a dependency that is briefly down at startup does not
+# keep /readyz at 503 until a restart. Fork-safe, read-only resources (models) can also be
+# loaded before the server forks workers (PRELOAD_RESOURCES=true, e.g. gunicorn --preload)
+# so the workers share those pages copy-on-write.
+class ResourceManager:
+    def __init__(self, mode="background", retry_initial=1.0, retry_max=60.0):
+        self.mode = mode
+        self.retry_initial = retry_initial
+        self.retry_max = retry_max
+        self.resources = {}
+        self._task = None
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            mode=os.getenv("STARTUP_WARMUP", "background"),
+            retry_max=float(os.getenv("RESOURCE_RETRY_MAX_SECONDS", "60")),
+        )
+
+    # warm is a plain or async function that forces the resource to load
+    def register(self, name, warm, required=True, fork_safe=False, always=False):
+        self.resources[name] = {
+            "warm": warm, "required": required, "fork_safe": fork_safe, "always": always,
+            "state": "pending", "seconds": None, "error": None, "attempts": 0,
+        }
+
+    async def _warm(self, name):
+        resource = self.resources[name]
+        if resource["state"] == "ready":
+            return
+        resource["state"] = "loading"
+        resource["attempts"] += 1
+        start = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(resource["warm"]):
+                await resource["warm"]()
+            else:
+                await asyncio.to_thread(resource["warm"])
+            resource.update(state="ready", error=None)
+        except Exception as e:
+            resource.update(state="failed", error=str(e))
+            log_event(logger, "resource warm-up failed", logging.ERROR, resource=name, error=str(e))
+        resource["seconds"] = round(time.perf_counter() - start, 3)
+
+    async def warm_up(self, names=None):
+        names = list(self.resources) if names is None else names
+        await asyncio.gather(*[self._warm(name) for name in names])
+        log_event(logger, "resources warmed", **{name: self.resources[name]["seconds"] for name in names})
+
+    async def _retry_failed(self):
+        delay = self.retry_initial
+        while failed := [name for name, r in self.resources.items() if r["state"] == "failed"]:
+            await asyncio.sleep(delay)
+            await asyncio.gather(*[self._warm(name) for name in failed])
+            delay = min(delay * 2, self.retry_max)
+
+    async def _background(self, names):
+        if names:
+            await self.warm_up(names)
+        await self._retry_failed()
+
+    # Load fork-safe resources in the current (pre-fork) process, then move everything
+    # allocated so far out of the garbage collector's reach so it is not copied on write
+    def preload(self):
+        for name, resource in self.resources.items():
+            if resource["fork_safe"] and resource["state"] != "ready":
+                start = time.perf_counter()
+                resource["warm"]()
+                resource.update(state="ready", seconds=round(time.perf_counter() - start, 3))
+        gc.freeze()
+
+    async def start(self):
+        if self.mode == "blocking":
+            await self.warm_up()
+            names = []
+        elif self.mode == "background":
+            names = list(self.resources)
+        else:
+            names = [name for name, r in self.resources.items() if r["always"]]
+        self._task = asyncio.create_task(self._background(names))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    # Lazy mode serves immediately and loads on first use; otherwise every required
+    # resource must have warmed successfully
+    @property
+    def ready(self):
+        if self.mode == "lazy":
+            return True
+        return all(r["state"] == "ready" for r in self.resources.values() if r["required"])
+
+    def status(self):
+        return {
+            name: {key: r[key] for key in ("state", "seconds", "error", "attempts")}
+            for name, r in self.resources.items()
+        }
+
+
+# GET /healthz (process is up) and GET /readyz (resources warmed, 503 until then)
+def add_health_routes(app, manager):
+    @app.get("/healthz", include_in_schema=False)
+    def healthz():
+        return {"status": "ok"}
+
+    @app.get("/readyz", include_in_schema=False)
+    def readyz(response: Response):
+        if not manager.ready:
+            response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"ready": manager.ready, "resources": manager.status()}
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from botocore.exceptions import ClientError  # type: ignore
+
+_client = None
+_client_lock = threading.Lock()
+
+
+# Raised when a resume is larger than the configured download limit
+class ResumeTooLargeError(Exception):
+    pass
+
+
+# Split a resume URL into S3 bucket and key
+def parse_s3_url(resume_url: str):
+    parsed = urlparse(resume_url)
+    return parsed.netloc.split('.')[0], parsed.path.lstrip('/')
+
+
+# Shared S3 client for the resume bucket. boto3 clients are thread-safe, so one client
+# (and its connection pool) is built lazily and reused by every download thread.
+def get_s3_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                import boto3  # type: ignore
+                from botocore.config import Config  # type: ignore
+
+                _client = boto3.session.Session().client(
+                    's3',
+                    aws_access_key_id=os.getenv("Resume_AWS_ACCESS_KEY_ID"),
+                    aws_secret_access_key=os.getenv("Resume_AWS_SECRET_ACCESS_KEY"),
+                    region_name=os.getenv("Resume_AWS_REGION"),
+                    endpoint_url=os.getenv("S3_ENDPOINT_URL") or None,
+                    config=Config(
+                        max_pool_connections=int(os.getenv("S3_MAX_POOL_CONNECTIONS", "50")),
+                        retries={"max_attempts": 3, "mode": "adaptive"},
+                        tcp_keepalive=True,
+                    )
+                )
+    return _client
+
+
+# Bounded concurrent resume downloads over the shared client. Objects above part_size
+# are fetched as parallel ranged GETs; objects above max_bytes are rejected up front.
+class ResumeDownloader:
+    def __init__(self, client_factory=get_s3_client, max_concurrency=16,
+                 max_bytes=10 * 1024 * 1024, part_size=4 * 1024 * 1024):
+        self.client_factory = client_factory
+        self.max_bytes = max_bytes
+        self.part_size = part_size
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="s3-download")
+        self._range_executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="s3-range")
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @classmethod
+    def from_env(cls, **overrides):
+        settings = {
+            "max_concurrency": int(os.getenv("S3_DOWNLOAD_CONCURRENCY", "16")),
+            "max_bytes": int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024))),
+            "part_size": int(os.getenv("S3_PART_SIZE", str(4 * 1024 * 1024))),
+        }
+        settings.update(overrides)
+        return cls(**settings)
+
+    # The first request is a ranged GET for part one, so small resumes need a single
+    # round trip and the total size (from Content-Range) is known before reading the body
+    def download(self, resume_url):
+        bucket, key = parse_s3_url(resume_url)
+        s3 = self.client_factory()
+        try:
+            first = s3.get_object(Bucket=bucket, Key=key, Range=f"bytes=0-{self.part_size - 1}")
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "InvalidRange":
+                return b""  # empty object
+            raise
+        content_range = first.get("ContentRange")
+        size = int(content_range.rsplit("/", 1)[1]) if content_range else first["ContentLength"]
+        if size > self.max_bytes:
+            first["Body"].close()
+            raise ResumeTooLargeError(f"{resume_url} is {size} bytes (limit {self.max_bytes})")
+        head = first["Body"].read()
+        if len(head) >= size:
+            return head
+
+        buf = bytearray(size)
+        buf[:len(head)] = head
+
+        def fetch_range(start):
+            end = min(start + self.part_size, size) - 1
+            body = s3.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-{end}")["Body"]
+            buf[start:end + 1] = body.read()
+
+        list(self._range_executor.map(fetch_range, range(len(head), size, self.part_size)))
+        return buf
+
+    async def download_async(self, resume_url):
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self.download, resume_url)
@@ -0,0 +1,293 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ["queued", "running"]
+
+
+# New job document: one item per resume so progress survives restarts at resume granularity
+def new_job(params, resume_urls):
+    now = datetime.utcnow()
+    return {
+        "_id": uuid.uuid4().hex,
+        "status": "queued",
+        "params": params,
+        "total": len(resume_urls),
+        "processed": 0,
+        "items": [{"resumeUrl": url, "status": "pending", "result": None} for url in resume_urls],
+        "shortlisted_candidates": [],
+        "error": None,
+        "owner": None,
+        "lease_until": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+# Job persistence in MongoDB through an async (Motor) collection
+class MongoJobStore:
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def ensure_indexes(self):
+        await self.collection.create_index([("status", 1), ("lease_until", 1)])
+
+    async def create(self, job):
+        await self.collection.insert_one(job)
+        return job["_id"]
+
+    async def get(self, job_id):
+        return await self.collection.find_one({"_id": job_id})
+
+    async def set_status(self, job_id, status, **fields):
+        update = {"status": status, "updated_at": datetime.utcnow(), **fields}
+        await self.collection.update_one({"_id": job_id}, {"$set": update})
+
+    async def complete_item(self, job_id, index, status, result=None):
+        await self.collection.update_one(
+            {"_id": job_id, f"items.{index}.status": "pending"},
+            {
+                "$set": {
+                    f"items.{index}.status": status,
+                    f"items.{index}.result": result,
+                    "updated_at": datetime.utcnow(),
+                },
+                "$inc": {"processed": 1},
+            }
+        )
+
+    # Atomically take an active job that is unclaimed or whose lease has expired;
+    # None if it is finished or another worker holds a live lease
+    async def claim(self, job_id, owner, lease_until, now):
+        return await self.collection.find_one_and_update(
+            {
+                "_id": job_id,
+                "status": {"$in": ACTIVE_STATUSES},
+                "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}],
+            },
+            {"$set": {"status": "running", "owner": owner, "lease_until": lease_until, "updated_at": now}},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    # Extend a held lease; False once another worker has taken the job over
+    async def renew(self, job_id, owner, lease_until):
+        result = await self.collection.update_one(
+            {"_id": job_id, "owner": owner, "status": "running"}, {"$set": {"lease_until": lease_until}}
+        )
+        return result.matched_count == 1
+
+    # Active jobs with an expired lease, or never claimed and not touched since stale_before
+    async def claimable(self, now, stale_before):
+        return await self.collection.find(
+            {
+                "status": {"$in": ACTIVE_STATUSES},
+                "$or": [
+                    {"lease_until": {"$lt": now}},
+                    {"lease_until": None, "updated_at": {"$lt": stale_before}},
+                ],
+            },
+            {"_id": 1}
+        ).to_list(None)
+
+
+# In-process job store for tests and local runs without MongoDB
+class InMemoryJobStore:
+    def __init__(self):
+        self.jobs = {}
+
+    async def ensure_indexes(self):
+        pass
+
+    async def create(self, job):
+        self.jobs[job["_id"]] = job
+        return job["_id"]
+
+    async def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    async def set_status(self, job_id, status, **fields):
+        self.jobs[job_id].update(status=status, updated_at=datetime.utcnow(), **fields)
+
+    async def complete_item(self, job_id, index, status, result=None):
+        job = self.jobs[job_id]
+        item = job["items"][index]
+        if item["status"] != "pending":
+            return
+        item.update(status=status, result=result)
+        job["processed"] += 1
+        job["updated_at"] = datetime.utcnow()
+
+    async def claim(self, job_id, owner, lease_until, now):
+        job = self.jobs.get(job_id)
+        if job is None or job["status"] not in ACTIVE_STATUSES:
+            return None
+        if job["lease_until"] is not None and job["lease_until"] >= now:
+            return None
+        job.update(status="running", owner=owner, lease_until=lease_until, updated_at=now)
+        return job
+
+    async def renew(self, job_id, owner, lease_until):
+        job = self.jobs.get(job_id)
+        if job is None or job["owner"] != owner or job["status"] != "running":
+            return False
+        job["lease_until"] = lease_until
+        return True
+
+    async def claimable(self, now, stale_before):
+        return [
+            {"_id": job_id} for job_id, job in self.jobs.items()
+            if job["status"] in ACTIVE_STATUSES and (
+                (job["lease_until"] is not None and job["lease_until"] < now)
+                or (job["lease_until"] is None and job["updated_at"] < stale_before)
+            )
+        ]
+
+
+# Background shortlist runner. prefetch(params, resume_urls), if given, loads data shared
+# by a job's pending items in one go (e.g. applicant details); process_item(params,
+# resume_url, prefetched) scores one resume and finalize(params, results) ranks and stores
+# the shortlist once every item is done.
+# A worker claims a job atomically with a lease it renews while the job runs, so with
+# several processes (uvicorn --workers, restarts) each job runs in one place at a time.
+# A periodic sweep re-queues jobs whose lease expired (their worker died) and jobs that
+# were submitted but not claimed within a lease period.
+class ShortlistJobQueue:
+    def __init__(self, store, process_item, finalize, prefetch=None, workers=1, item_concurrency=8,
+                 lease_seconds=60):
+        self.store = store
+        self.process_item = process_item
+        self.finalize = finalize
+        self.prefetch = prefetch
+        self.workers = workers
+        self.item_concurrency = item_concurrency
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._queue = asyncio.Queue()
+        self._queued = set()
+        self._tasks = []
+
+    @classmethod
+    def from_env(cls, store, process_item, finalize, prefetch=None):
+        return cls(
+            store, process_item, finalize, prefetch,
+            workers=int(os.getenv("SHORTLIST_JOB_WORKERS", "1")),
+            item_concurrency=int(os.getenv("SHORTLIST_JOB_CONCURRENCY", "8")),
+            lease_seconds=float(os.getenv("SHORTLIST_JOB_LEASE_SECONDS", "60")),
+        )
+
+    # Does not touch the store: indexes are created by the caller (see store.ensure_indexes)
+    # and unfinished jobs are found by the recovery sweep, which retries until it succeeds
+    async def start(self):
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._recover()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, params, resume_urls):
+        job_id = await self.store.create(new_job(params, resume_urls))
+        self._enqueue(job_id)
+        return job_id
+
+    def _enqueue(self, job_id):
+        if job_id not in self._queued:
+            self._queued.add(job_id)
+            self._queue.put_nowait(job_id)
+
+    def _lease_until(self):
+        return datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+
+    async def _recover(self):
+        while True:
+            try:
+                now = datetime.utcnow()
+                for job in await self.store.claimable(now, now - timedelta(seconds=self.lease_seconds)):
+                    logger.info(f"Resuming shortlist job {job['_id']}")
+                    self._enqueue(job["_id"])
+            except Exception as e:
+                logger.warning(f"Shortlist job recovery sweep failed: {e}")
+            await asyncio.sleep(self.lease_seconds)
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            self._queued.discard(job_id)
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                logger.error(f"Shortlist job {job_id} failed: {e}")
+                await self._mark_failed(job_id, e)
+            finally:
+                self._queue.task_done()
+
+    # A failed status write (e.g. MongoDB unavailable) must not end the worker loop; the
+    # job's lease then expires and the recovery sweep retries it
+    async def _mark_failed(self, job_id, error):
+        try:
+            await self.store.set_status(job_id, "failed", error=str(error), lease_until=None)
+        except Exception as e:
+            logger.error(f"Shortlist job {job_id}: could not record failure: {e}")
+
+    async def _run(self, job_id):
+        job = await self.store.claim(job_id, self.owner, self._lease_until(), datetime.utcnow())
+        if job is None:
+            return
+        work = asyncio.create_task(self._process(job))
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, work))
+        try:
+            await asyncio.wait([work])
+        finally:
+            heartbeat.cancel()
+            work.cancel()
+        if work.cancelled():
+            logger.warning(f"Shortlist job {job_id}: lease taken over by another worker, stopped")
+            return
+        work.result()
+
+    # Renew the lease while the job runs; stop the job if another worker took it over
+    async def _heartbeat(self, job_id, work):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                held = await self.store.renew(job_id, self.owner, self._lease_until())
+            except Exception as e:
+                logger.warning(f"Shortlist job {job_id}: lease renewal failed: {e}")
+                continue
+            if not held:
+                work.cancel()
+                return
+
+    async def _process(self, job):
+        job_id = job["_id"]
+        params = job["params"]
+        semaphore = asyncio.Semaphore(self.item_concurrency)
+        pending = [(index, item) for index, item in enumerate(job["items"]) if item["status"] == "pending"]
+        prefetched = None
+        if self.prefetch is not None and pending:
+            prefetched = await self.prefetch(params, [item["resumeUrl"] for _, item in pending])
+
+        async def run_item(index, item):
+            async with semaphore:
+                try:
+                    result = await self.process_item(params, item["resumeUrl"], prefetched)
+                    await self.store.complete_item(job_id, index, "done", result)
+                except Exception as e:
+                    logger.error(f"Shortlist job {job_id}: {item['resumeUrl']} failed: {e}")
+                    await self.store.complete_item(job_id, index, "failed")
+
+        await asyncio.gather(*[run_item(index, item) for index, item in pending])
+
+        job = await self.store.get(job_id)
+        results = [item["result"] for item in job["items"] if item["result"]]
+        shortlisted = await self.finalize(params, results)
+        await self.store.set_status(job_id, "completed", shortlisted_candidates=shortlisted, lease_until=None)
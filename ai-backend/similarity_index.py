@@ -0,0 +1,251 @@
+import hashlib
+import itertools
+import logging
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import scipy.sparse as sp
+
+from cache import LRUCache
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+N_FEATURES = 2 ** 18
+
+# Texts are hashed in chunks of this many documents; the hasher's per-token buffers for a
+# whole batch are several times the size of the text itself
+VECTORIZE_CHUNK = int(os.getenv("SIMILARITY_VECTORIZE_CHUNK", "128"))
+
+
+# scikit-learn takes most of the service's import time, so it is imported on first use
+def load_sklearn():
+    from sklearn.feature_extraction.text import HashingVectorizer  # type: ignore
+    from sklearn.preprocessing import normalize  # type: ignore
+
+    return HashingVectorizer, normalize
+
+
+# Content digest of a resume text, used when the caller has none (e.g. a TextRef's)
+def text_digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# Per-internship TF-IDF index. Raw term counts come from a stateless HashingVectorizer
+# and document frequencies are kept alongside, so resumes can be added without refitting
+# and scores stay comparable across runs (same weighting as TfidfVectorizer's defaults).
+# Each row keeps the digest of the text it was built from, so unchanged resumes are not
+# hashed again.
+# Document frequencies cover the indexed resumes only; the query is not counted, so scores
+# differ slightly from a TfidfVectorizer fitted on the resumes plus the job description.
+class SimilarityIndex:
+    def __init__(self, n_features=N_FEATURES):
+        HashingVectorizer, _ = load_sklearn()
+        self.vectorizer = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None)
+        self.ids = []
+        self.digests = []
+        self.counts = sp.csr_matrix((0, n_features), dtype=np.float32)
+        self.df = np.zeros(n_features, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    # Hash texts (any iterable, consumed lazily) into float32 term counts, chunk by chunk
+    def _count(self, texts):
+        texts = iter(texts)
+        chunks = []
+        while chunk := list(itertools.islice(texts, VECTORIZE_CHUNK)):
+            chunks.append(self.vectorizer.transform(chunk).astype(np.float32))
+        if not chunks:
+            return sp.csr_matrix((0, self.counts.shape[1]), dtype=np.float32)
+        return sp.vstack(chunks, format="csr")
+
+    # Positions of ids that are not indexed yet or were indexed from different content
+    def stale(self, ids, digests):
+        current = dict(zip(self.ids, self.digests))
+        return [i for i, (doc_id, digest) in enumerate(zip(ids, digests)) if current.get(doc_id) != digest]
+
+    # Add new resumes and replace changed ones; ids are resume URLs, texts may be a generator
+    # and is consumed lazily. Rows whose digest matches the indexed one are skipped, without
+    # hashing their text. Returns whether the index changed.
+    def add(self, ids, texts, digests=None):
+        digests = list(digests) if digests is not None else None
+        current = dict(zip(self.ids, self.digests))
+        added_ids, added_digests = [], []
+
+        def changed_texts():
+            for i, (doc_id, text) in enumerate(zip(ids, texts)):
+                digest = digests[i] if digests is not None else text_digest(text)
+                if current.get(doc_id) != digest:
+                    current[doc_id] = digest
+                    added_ids.append(doc_id)
+                    added_digests.append(digest)
+                    yield text
+
+        new_counts = self._count(changed_texts())
+        if not added_ids:
+            return False
+
+        replaced = set(added_ids)
+        keep = [i for i, existing in enumerate(self.ids) if existing not in replaced]
+        if len(keep) < len(self.ids):
+            dropped = self.counts[[i for i, existing in enumerate(self.ids) if existing in replaced]]
+            self.df -= np.asarray((dropped > 0).sum(axis=0)).ravel()
+            self.counts = self.counts[keep]
+            self.ids = [self.ids[i] for i in keep]
+            self.digests = [self.digests[i] for i in keep]
+
+        self.df += np.asarray((new_counts > 0).sum(axis=0)).ravel()
+        self.counts = sp.vstack([self.counts, new_counts], format="csr")
+        self.ids.extend(added_ids)
+        self.digests.extend(added_digests)
+        return True
+
+    def _idf(self):
+        n_docs = len(self.ids)
+        return (np.log((1 + n_docs) / (1 + self.df)) + 1).astype(np.float32)
+
+    def _weigh(self, counts):
+        _, normalize = load_sklearn()
+        return normalize(sp.csr_matrix(counts.multiply(self._idf())), norm="l2", copy=False)
+
+    # Cosine similarity of the query against indexed resumes (all, or only the given ids)
+    def scores(self, query_text, ids=None):
+        if not self.ids:
+            return {}
+        rows = list(range(len(self.ids)))
+        if ids is not None:
+            position = {doc_id: i for i, doc_id in enumerate(self.ids)}
+            rows = [position[doc_id] for doc_id in ids if doc_id in position]
+        # Terms no indexed resume contains are dropped, as TfidfVectorizer drops out-of-vocabulary words
+        query = self._weigh(self.vectorizer.transform([query_text]).multiply(self.df > 0))
+        sims = (self._weigh(self.counts[rows]) @ query.T).toarray().ravel()
+        return {self.ids[row]: float(sim) for row, sim in zip(rows, sims)}
+
+    def top_k(self, query_text, k=10):
+        scores = self.scores(query_text)
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+    def save(self, path):
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            data=self.counts.data, indices=self.counts.indices, indptr=self.counts.indptr,
+            shape=np.array(self.counts.shape), df=self.df, ids=np.array(self.ids, dtype=str),
+            digests=np.array(self.digests, dtype=str),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as stored:
+            index = cls(n_features=int(stored["shape"][1]))
+            index.counts = sp.csr_matrix(
+                (stored["data"], stored["indices"], stored["indptr"]), shape=tuple(stored["shape"])
+            )
+            index.df = stored["df"]
+            index.ids = [str(doc_id) for doc_id in stored["ids"]]
+            # Indexes saved before digests were kept re-hash each resume once
+            index.digests = ([str(digest) for digest in stored["digests"]] if "digests" in stored
+                             else [""] * len(index.ids))
+        return index
+
+
+# Exclusive advisory lock on a sidecar file, held for a whole read-modify-write of an index
+@contextmanager
+def _file_lock(path):
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after ~10 s
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# Identity of the index file as last written; saves replace the file, so this changes
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+# Loads, caches and persists one SimilarityIndex per internship under SIMILARITY_INDEX_DIR.
+# Several worker processes can share the directory: a cached copy is reloaded whenever the
+# file changed since it was read, and add() re-reads, extends and saves the index under a
+# file lock, so one process's additions are never overwritten by another's stale copy.
+# Callers check stale() first, so a run over already indexed resumes takes no lock and
+# writes nothing.
+class SimilarityIndexStore:
+    def __init__(self, directory, max_loaded=32):
+        self.directory = directory
+        self.loaded = LRUCache(max_entries=max_loaded)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            os.getenv("SIMILARITY_INDEX_DIR", "similarity_index"),
+            max_loaded=int(os.getenv("SIMILARITY_INDEX_CACHE", "32")),
+        )
+
+    def _path(self, internship_id):
+        name = hashlib.sha1(str(internship_id).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{name}.npz")
+
+    def _get(self, internship_id):
+        path = self._path(internship_id)
+        signature = _file_signature(path)
+        cached = self.loaded.get(internship_id)
+        if cached is not None and cached[1] == signature:
+            return cached[0]
+        index = SimilarityIndex.load(path) if signature else SimilarityIndex()
+        self.loaded.put(internship_id, (index, signature))
+        return index
+
+    # Positions of the ids whose content (digest) is not in the internship's index yet
+    def stale(self, internship_id, ids, digests):
+        with self._lock:
+            return self._get(internship_id).stale(ids, digests)
+
+    # Index new or changed resumes for an internship and persist the index if it changed
+    def add(self, internship_id, ids, texts, digests=None):
+        path = self._path(internship_id)
+        with self._lock, _file_lock(f"{path}.lock"):
+            index = self._get(internship_id)
+            if index.add(ids, texts, digests):
+                index.save(path)
+                self.loaded.put(internship_id, (index, _file_signature(path)))
+
+    def scores(self, internship_id, query_text, ids=None):
+        with self._lock:
+            return self._get(internship_id).scores(query_text, ids)
+
+    def top_k(self, internship_id, query_text, k=10):
+        with self._lock:
+            return self._get(internship_id).top_k(query_text, k)
+
+
+similarity_store = SimilarityIndexStore.from_env()
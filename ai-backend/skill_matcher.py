@@ -0,0 +1,83 @@
+import hashlib
+import json
+import re
+
+
+# Strip everything except letters, digits and the symbols used in skill names (c++, c#, node.js).
+# casefold, not lower: "ſql" folds to "sql", and "İ" lowers to "i" plus a combining dot that is stripped
+def compact_skill_name(name):
+    return re.sub(r"[^a-z0-9.#+]", "", name.casefold().strip())
+
+
+# Regex fragment for one trie edge; spaces in multi-word skills match any whitespace run
+def _char_pattern(ch):
+    return r"\s+" if ch == " " else re.escape(ch)
+
+
+# Build a trie-shaped alternation so the regex engine branches per character instead of
+# trying every skill at every position; cost grows with text length, not dictionary size
+def _trie_pattern(terms):
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [_char_pattern(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+# Single-pass matcher over a skill taxonomy of canonical names and their aliases.
+# version identifies the taxonomy, so results cached under another taxonomy can be told apart.
+class SkillMatcher:
+    def __init__(self, taxonomy):
+        self.version = hashlib.sha256(json.dumps(taxonomy, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        self._canonical = {}
+        self._compact = {}
+        for canonical, aliases in taxonomy.items():
+            for term in [canonical, *aliases]:
+                term = " ".join(term.lower().split())
+                self._canonical[term] = canonical
+                self._compact.setdefault(compact_skill_name(term), canonical)
+        # Longest match wins; the lookarounds replace \b so terms ending in symbols (c++, c#) still match
+        self.pattern = re.compile(
+            r"(?<![\w])(?:" + _trie_pattern(self._canonical) + r")(?![\w])",
+            re.IGNORECASE
+        )
+
+    @classmethod
+    def from_file(cls, path, base=None):
+        with open(path, "r", encoding="utf-8") as f:
+            taxonomy = json.load(f)
+        if isinstance(taxonomy, list):
+            taxonomy = {skill: [] for skill in taxonomy}
+        merged = dict(base or {})
+        for canonical, aliases in taxonomy.items():
+            merged[canonical] = [*merged.get(canonical, []), *aliases]
+        return cls(merged)
+
+    # Canonical name for a skill or alias, or None if it is not in the taxonomy
+    def canonical(self, name):
+        term = " ".join(name.lower().split())
+        return self._canonical.get(term) or self._compact.get(compact_skill_name(term))
+
+    # Canonical names of every taxonomy skill mentioned in the text. IGNORECASE also matches
+    # characters that do not lower back to the stored term (İ, ſ, K), so each match is
+    # resolved through canonical() and dropped if it cannot be mapped
+    def find(self, text):
+        found = {self.canonical(match) for match in self.pattern.findall(text)}
+        found.discard(None)
+        return found
+
+    def __contains__(self, name):
+        return self.canonical(name) is not None
+
+    def __len__(self):
+        return len(self._canonical)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the service modules the same way the services do, from ai-backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,34 @@
+import base64
+
+import pytest
+from bson import ObjectId
+
+from pagination import InvalidCursorError, after_cursor, decode_cursor, encode_cursor
+
+SORT = [("readiness_score", -1), ("_id", -1)]
+
+
+def token(raw):
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def test_cursor_round_trip():
+    doc = {"_id": ObjectId(), "readiness_score": 80, "text": "not part of the cursor"}
+    assert decode_cursor(encode_cursor(doc, SORT), SORT) == {"readiness_score": 80, "_id": doc["_id"]}
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!", token(b"not json"), token(b"{}"), token(b"[1]"), token(b"null"),
+    token(b'{"readiness_score": 80}'),
+])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, SORT)
+
+
+def test_after_cursor_is_keyset_filter():
+    last = {"readiness_score": 80, "_id": 7}
+    assert after_cursor(SORT, last) == {"$or": [
+        {"readiness_score": {"$lt": 80}},
+        {"readiness_score": 80, "_id": {"$lt": 7}},
+    ]}
@@ -0,0 +1,109 @@
+# ResumeDownloader against moto's in-process S3. Requires: pip install -r requirements-dev.txt
+import asyncio
+import os
+
+import boto3  # type: ignore
+import pytest
+from botocore.exceptions import ClientError  # type: ignore
+from moto import mock_aws
+
+from s3_resumes import ResumeDownloader, ResumeTooLargeError
+
+BUCKET = "test-resumes"
+PART_SIZE = 64 * 1024
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def put(s3, key, body):
+    s3.put_object(Bucket=BUCKET, Key=key, Body=body)
+    return f"https://{BUCKET}.s3.amazonaws.com/{key}"
+
+
+# Records every Range header so tests can tell which download path was taken
+def recording(s3):
+    ranges = []
+    get_object = s3.get_object
+
+    def record(**kwargs):
+        ranges.append(kwargs.get("Range"))
+        return get_object(**kwargs)
+
+    s3.get_object = record
+    return ranges
+
+
+def downloader(s3, **settings):
+    return ResumeDownloader(client_factory=lambda: s3, max_concurrency=4, **settings)
+
+
+def test_small_object_is_one_request(s3):
+    body = os.urandom(PART_SIZE // 2)
+    url = put(s3, "small.pdf", body)
+    ranges = recording(s3)
+
+    assert bytes(downloader(s3, part_size=PART_SIZE).download(url)) == body
+    assert ranges == [f"bytes=0-{PART_SIZE - 1}"]
+
+
+def test_large_object_is_fetched_as_ranged_parts(s3):
+    body = os.urandom(PART_SIZE * 3 + 123)
+    url = put(s3, "large.pdf", body)
+    ranges = recording(s3)
+
+    assert bytes(downloader(s3, part_size=PART_SIZE).download(url)) == body
+    assert sorted(ranges) == sorted([
+        f"bytes=0-{PART_SIZE - 1}",
+        f"bytes={PART_SIZE}-{2 * PART_SIZE - 1}",
+        f"bytes={2 * PART_SIZE}-{3 * PART_SIZE - 1}",
+        f"bytes={3 * PART_SIZE}-{len(body) - 1}",
+    ])
+
+
+def test_object_of_exactly_one_part(s3):
+    body = os.urandom(PART_SIZE)
+    url = put(s3, "exact.pdf", body)
+
+    assert bytes(downloader(s3, part_size=PART_SIZE).download(url)) == body
+
+
+def test_object_over_limit_is_rejected_after_first_request(s3):
+    url = put(s3, "huge.pdf", os.urandom(PART_SIZE * 4))
+    ranges = recording(s3)
+
+    with pytest.raises(ResumeTooLargeError):
+        downloader(s3, part_size=PART_SIZE, max_bytes=PART_SIZE * 2).download(url)
+    assert len(ranges) == 1
+
+
+# S3 answers a ranged GET on an empty object with InvalidRange
+def test_empty_object(s3):
+    url = put(s3, "empty.pdf", b"")
+    ranges = recording(s3)
+
+    assert downloader(s3, part_size=PART_SIZE).download(url) == b""
+    assert len(ranges) == 1
+
+
+def test_missing_object_raises(s3):
+    with pytest.raises(ClientError):
+        downloader(s3, part_size=PART_SIZE).download(f"https://{BUCKET}.s3.amazonaws.com/missing.pdf")
+
+
+def test_download_async(s3):
+    bodies = [os.urandom(PART_SIZE + i) for i in range(6)]
+    urls = [put(s3, f"async/{i}.pdf", body) for i, body in enumerate(bodies)]
+    pool = downloader(s3, part_size=PART_SIZE)
+
+    async def download_all():
+        return await asyncio.gather(*[pool.download_async(url) for url in urls])
+
+    assert [bytes(data) for data in asyncio.run(download_all())] == bodies
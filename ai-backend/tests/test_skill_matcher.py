@@ -0,0 +1,44 @@
+import pytest
+
+from skill_matcher import SkillMatcher, compact_skill_name
+
+TAXONOMY = {"Git": [], "SQL": [], "Jira": [], "Kotlin": [], "node.js": ["nodejs"], "c++": [], "rest api": []}
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return SkillMatcher(TAXONOMY)
+
+
+# Case-insensitive matches that do not lower back to the stored term (Turkish dotted I,
+# long s, Kelvin sign) must resolve to the canonical name instead of raising
+@pytest.mark.parametrize("text, expected", [
+    ("GİT", {"Git"}),
+    ("ſql", {"SQL"}),
+    ("Jİra", {"Jira"}),
+    ("\u212aotlin", {"Kotlin"}),  # Kelvin sign
+    ("Used GİT and Jİra daily", {"Git", "Jira"}),
+])
+def test_unicode_case_matches_resolve_to_canonical(matcher, text, expected):
+    assert matcher.find(text) == expected
+
+
+def test_aliases_symbols_and_whitespace(matcher):
+    text = "Built NodeJS services in C++ behind a REST\n API; no gitlab or mysql."
+    assert matcher.find(text) == {"node.js", "c++", "rest api"}
+
+
+def test_canonical(matcher):
+    assert matcher.canonical("NODEJS") == "node.js"
+    assert matcher.canonical("Rest  API") == "rest api"
+    assert matcher.canonical("cobol") is None
+
+
+def test_compact_skill_name():
+    assert compact_skill_name(" Node.JS ") == "node.js"
+    assert compact_skill_name("ſql") == "sql"
+
+
+def test_version_follows_taxonomy():
+    assert SkillMatcher(TAXONOMY).version == SkillMatcher(dict(TAXONOMY)).version
+    assert SkillMatcher(TAXONOMY).version != SkillMatcher({**TAXONOMY, "rust": []}).version